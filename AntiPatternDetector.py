@@ -0,0 +1,438 @@
+"""
+Python Anti-Pattern Detector
+Single-pass AST detection of the performance anti-patterns in MemoryAndPerformance.py
+"""
+
+import argparse
+import ast
+import json
+import os
+import sys
+import time
+import warnings
+
+from MonitoringTools import fit_complexity
+
+# LOOP AND SCOPE TRACKING
+
+# Builtins whose cost grows with their input and whose result only depends on their arguments.
+# Those returning fresh mutable containers are left out: each iteration may need its own copy.
+_LINEAR_BUILTINS = frozenset(('all', 'any', 'frozenset', 'max', 'min', 'sum', 'tuple'))
+_PURE_BUILTINS = _LINEAR_BUILTINS | frozenset((
+    'abs', 'bool', 'dict', 'enumerate', 'float', 'int', 'len', 'list', 'range', 'reversed',
+    'round', 'set', 'sorted', 'str', 'zip',
+))
+_CONSTRUCTOR_KINDS = {
+    'dict': 'dict', 'frozenset': 'set', 'list': 'list', 'set': 'set', 'sorted': 'list',
+    'str': 'str', 'tuple': 'tuple',
+}
+
+
+class _Loop:
+    """One loop level: names it rebinds or mutates, and calls that may be invariant"""
+
+    __slots__ = ('node', 'assigned', 'candidates', 'height')
+
+    def __init__(self, node):
+        self.node = node
+        self.assigned = set()
+        self.candidates = []
+        self.height = 1  # Depth of the deepest loop nest starting here
+
+
+class _Candidate:
+    """Call inside a loop that is invariant unless it reads something the loop changes"""
+
+    __slots__ = ('node', 'names', 'pure', 'parent', 'invariant')
+
+    def __init__(self, node, parent):
+        self.node = node
+        self.names = set()
+        self.pure = True
+        self.parent = parent
+        self.invariant = False
+
+
+def _root_name(node):
+    while isinstance(node, (ast.Attribute, ast.Subscript)):
+        node = node.value
+    return node.id if isinstance(node, ast.Name) else None
+
+
+def _loop_cost(depth, per_iteration=''):
+    loops = 'n' if depth == 1 else f"n^{depth}"
+    return f"O({loops}*{per_iteration})" if per_iteration else f"O({loops})"
+
+# DETECTOR
+
+class AntiPatternDetector(ast.NodeVisitor):
+    """Finds the catalogued anti-patterns, with an estimated complexity class, in one AST pass"""
+
+    def __init__(self, max_loop_depth=3):
+        self.max_loop_depth = max_loop_depth
+        self.findings = []
+        self._dispatch = {}    # Node type -> visitor function
+        self._scopes = []      # (qualified name, {name: inferred kind}) per function or class
+        self._loops = []       # _Loop stack for the current scope
+        self._candidates = []  # Open _Candidate stack for the current scope
+
+    def detect(self, tree):
+        self.findings = []
+        self._scopes = [('<module>', {})]
+        self._loops = []
+        self._candidates = []
+        self.visit(tree)
+        self.findings.sort(key=lambda finding: (finding['line'], finding['column']))
+        return self.findings
+
+    def visit(self, node):
+        # Cache the visit_* lookup per node type; NodeVisitor builds the method name every call
+        visitor = self._dispatch.get(node.__class__)
+        if visitor is None:
+            visitor = getattr(type(self), 'visit_' + node.__class__.__name__,
+                              type(self).generic_visit)
+            self._dispatch[node.__class__] = visitor
+        return visitor(self, node)
+
+    def generic_visit(self, node):
+        visit = self.visit
+        for field in node._fields:
+            value = getattr(node, field, None)
+            if isinstance(value, list):
+                for item in value:
+                    if isinstance(item, ast.AST):
+                        visit(item)
+            elif isinstance(value, ast.AST):
+                visit(value)
+
+    def _report(self, node, pattern, message, complexity):
+        self.findings.append({
+            'line': node.lineno,
+            'column': node.col_offset + 1,
+            'severity': 'warning',
+            'pattern': pattern,
+            'message': message,
+            'complexity': complexity,
+            'function': self._scopes[-1][0],
+        })
+
+    # Type inference
+
+    def _kind(self, node):
+        """'str', 'list', 'set', 'dict' or 'tuple' when the expression's type is evident"""
+        if isinstance(node, ast.Constant):
+            return 'str' if isinstance(node.value, str) else None
+        if isinstance(node, ast.JoinedStr):
+            return 'str'
+        if isinstance(node, (ast.List, ast.ListComp)):
+            return 'list'
+        if isinstance(node, (ast.Set, ast.SetComp)):
+            return 'set'
+        if isinstance(node, (ast.Dict, ast.DictComp)):
+            return 'dict'
+        if isinstance(node, ast.Tuple):
+            return 'tuple'
+        if isinstance(node, ast.Name):
+            return self._scopes[-1][1].get(node.id)
+        if isinstance(node, ast.Call) and isinstance(node.func, ast.Name):
+            return _CONSTRUCTOR_KINDS.get(node.func.id)
+        if isinstance(node, ast.BinOp) and isinstance(node.op, ast.Add):
+            return self._kind(node.left) or self._kind(node.right)
+        return None
+
+    def _bind(self, target, value_kind):
+        if isinstance(target, ast.Name):
+            kinds = self._scopes[-1][1]
+            if value_kind is None:
+                kinds.pop(target.id, None)
+            else:
+                kinds[target.id] = value_kind
+
+    def _mark_assigned(self, name):
+        if name is not None and self._loops:
+            self._loops[-1].assigned.add(name)
+
+    # Scopes
+
+    def _visit_scope(self, node, name, body):
+        outer = self._scopes[-1][0]
+        qualname = name if outer == '<module>' else f"{outer}.{name}"
+        saved = self._loops, self._candidates
+        # A nested body runs when called, not once per iteration of the enclosing loop
+        self._scopes.append((qualname, {}))
+        self._loops, self._candidates = [], []
+        for child in body:
+            self.visit(child)
+        self._scopes.pop()
+        self._loops, self._candidates = saved
+
+    def visit_FunctionDef(self, node):
+        for decorator in node.decorator_list:
+            self.visit(decorator)
+        self.visit(node.args)
+        self._mark_assigned(node.name)
+        self._visit_scope(node, node.name, node.body)
+
+    visit_AsyncFunctionDef = visit_FunctionDef
+
+    def visit_ClassDef(self, node):
+        for child in node.decorator_list + node.bases + node.keywords:
+            self.visit(child)
+        self._mark_assigned(node.name)
+        self._visit_scope(node, node.name, node.body)
+
+    def visit_Lambda(self, node):
+        self.visit(node.args)
+        self._visit_scope(node, '<lambda>', (node.body,))
+
+    # Loops
+
+    def _enter_loop(self, node):
+        self._loops.append(_Loop(node))
+
+    def _exit_loop(self):
+        loop = self._loops.pop()
+        depth = len(self._loops) + 1
+
+        for candidate in loop.candidates:
+            candidate.invariant = candidate.pure and not (candidate.names & loop.assigned)
+            if candidate.invariant and not (candidate.parent and candidate.parent.invariant):
+                call = candidate.node
+                self._report(call, 'repeated_expensive_operations',
+                             f"{call.func.id}(...) does not change between iterations; "
+                             f"hoist it out of the loop", _loop_cost(depth, 'k'))
+
+        if self._loops:
+            parent = self._loops[-1]
+            parent.assigned |= loop.assigned
+            parent.height = max(parent.height, loop.height + 1)
+        elif loop.height > self.max_loop_depth:
+            self._report(loop.node, 'nested_loop_inefficiency',
+                         f"{loop.height} nested loops; index or group the data instead",
+                         _loop_cost(loop.height))
+
+    def visit_For(self, node):
+        self.visit(node.iter)  # Evaluated once, outside the loop
+        self._enter_loop(node)
+        self.visit(node.target)
+        for child in node.body:
+            self.visit(child)
+        self._exit_loop()
+        for child in node.orelse:
+            self.visit(child)
+
+    visit_AsyncFor = visit_For
+
+    def visit_While(self, node):
+        self._enter_loop(node)
+        self.visit(node.test)
+        for child in node.body:
+            self.visit(child)
+        self._exit_loop()
+        for child in node.orelse:
+            self.visit(child)
+
+    def _visit_comprehension(self, node, *elements):
+        for generator in node.generators:
+            self.visit(generator.iter)
+            self._enter_loop(generator)
+            self.visit(generator.target)
+            for condition in generator.ifs:
+                self.visit(condition)
+        for element in elements:
+            self.visit(element)
+        for _ in node.generators:
+            self._exit_loop()
+
+    def visit_ListComp(self, node):
+        self._visit_comprehension(node, node.elt)
+
+    visit_SetComp = visit_GeneratorExp = visit_ListComp
+
+    def visit_DictComp(self, node):
+        self._visit_comprehension(node, node.key, node.value)
+
+    # Statements
+
+    def visit_Assign(self, node):
+        self.visit(node.value)
+        value_kind = self._kind(node.value)
+        value = node.value
+        for target in node.targets:
+            self.visit(target)
+            self._bind(target, value_kind)
+            if (self._loops and isinstance(target, ast.Name) and isinstance(value, ast.BinOp)
+                    and isinstance(value.op, ast.Add) and isinstance(value.left, ast.Name)
+                    and value.left.id == target.id):
+                self._concatenation(node, target, value.right)
+
+    def visit_AugAssign(self, node):
+        self.visit(node.value)
+        self.visit(node.target)
+        self._mark_assigned(_root_name(node.target))
+        # In-place += on a list is extend; only a target known to be a str is rebuilt
+        if (self._loops and isinstance(node.op, ast.Add) and isinstance(node.target, ast.Name)
+                and self._kind(node.target) == 'str'):
+            self._concatenation(node, node.target, node.value)
+
+    def visit_AnnAssign(self, node):
+        if node.value is not None:
+            self.visit(node.value)
+        self.visit(node.target)
+        annotation = node.annotation
+        if isinstance(annotation, ast.Subscript):
+            annotation = annotation.value
+        kind = annotation.id if isinstance(annotation, ast.Name) else None
+        self._bind(node.target, kind if kind in ('str', 'list', 'set', 'dict', 'tuple') else None)
+
+    def _concatenation(self, node, target, added):
+        kind = self._kind(target) or self._kind(added)
+        depth = len(self._loops)
+        if kind == 'str':
+            self._report(node, 'string_concatenation_in_loop',
+                         f"'{target.id}' is rebuilt on every iteration; collect parts and ''.join them",
+                         _loop_cost(depth + 1))
+        elif kind == 'list':
+            self._report(node, 'list_concatenation_in_loop',
+                         f"'{target.id} = {target.id} + [...]' copies the list on every iteration; "
+                         f"use append or extend", _loop_cost(depth + 1))
+
+    # Expressions
+
+    def visit_Name(self, node):
+        if isinstance(node.ctx, ast.Load):
+            if self._candidates:
+                self._candidates[-1].names.add(node.id)
+        else:
+            self._mark_assigned(node.id)
+
+    def visit_Attribute(self, node):
+        if not isinstance(node.ctx, ast.Load):
+            self._mark_assigned(_root_name(node))
+        self.visit(node.value)
+
+    def visit_Subscript(self, node):
+        if not isinstance(node.ctx, ast.Load):
+            self._mark_assigned(_root_name(node))
+        self.visit(node.value)
+        self.visit(node.slice)
+
+    def visit_NamedExpr(self, node):
+        self.visit(node.value)
+        self._mark_assigned(node.target.id)
+
+    def visit_Call(self, node):
+        func = node.func
+        if isinstance(func, ast.Attribute):
+            # Any method call may mutate its receiver
+            self._mark_assigned(_root_name(func.value))
+
+        name = func.id if isinstance(func, ast.Name) else None
+        if name not in _PURE_BUILTINS:
+            # Nor can anything it is handed be assumed unchanged, e.g. helper(data)
+            for arg in node.args:
+                self._mark_assigned(_root_name(arg.value if isinstance(arg, ast.Starred) else arg))
+            for keyword in node.keywords:
+                self._mark_assigned(_root_name(keyword.value))
+            if self._candidates:
+                self._candidates[-1].pure = False
+
+        candidate = None
+        if self._loops and name in _LINEAR_BUILTINS and (node.args or node.keywords):
+            parent = self._candidates[-1] if self._candidates else None
+            candidate = _Candidate(node, parent)
+            self._candidates.append(candidate)
+
+        self.generic_visit(node)
+
+        if candidate is not None:
+            self._candidates.pop()
+            if candidate.parent is not None:
+                candidate.parent.names |= candidate.names
+                candidate.parent.pure = candidate.parent.pure and candidate.pure
+            self._loops[-1].candidates.append(candidate)
+
+    def visit_Compare(self, node):
+        self.generic_visit(node)
+        if not self._loops:
+            return
+        for op, comparator in zip(node.ops, node.comparators):
+            if isinstance(op, (ast.In, ast.NotIn)) and not isinstance(comparator, (ast.List, ast.Tuple)):
+                if self._kind(comparator) in ('list', 'tuple'):
+                    self._report(node, 'inefficient_membership_testing',
+                                 "membership test scans a list on every iteration; build a set once",
+                                 _loop_cost(len(self._loops), 'm'))
+
+
+def detect_anti_patterns(source, filename='<unknown>', max_loop_depth=3):
+    """Findings for one source file; files that do not parse are left to SyntaxChecker"""
+    try:
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore')  # SyntaxWarnings are SyntaxChecker's to report
+            tree = ast.parse(source, filename)
+    except (SyntaxError, ValueError):
+        return []
+    return AntiPatternDetector(max_loop_depth).detect(tree)
+
+# BENCHMARK
+
+def benchmark_anti_pattern_detector(sizes=(50000, 100000, 200000, 400000), seed_path=None):
+    """Parse and visit time for codebases of many fixture-sized files, extrapolated to 1M lines"""
+    if seed_path is None:
+        seed_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'MemoryAndPerformance.py')
+    with open(seed_path, encoding='utf-8') as f:
+        seed = f.read()
+    seed_lines = seed.count('\n') + 1
+
+    runs = []
+    for lines in sizes:
+        files = max(1, lines // seed_lines)
+        parse_seconds = visit_seconds = 0.0
+        findings = 0
+        # One tree at a time, as when walking a real codebase file by file
+        for _ in range(files):
+            started = time.perf_counter()
+            tree = ast.parse(seed)
+            parsed = time.perf_counter()
+            findings += len(AntiPatternDetector().detect(tree))
+            visit_seconds += time.perf_counter() - parsed
+            parse_seconds += parsed - started
+            del tree
+
+        runs.append({
+            'files': files,
+            'lines': files * seed_lines,
+            'findings': findings,
+            'parse_seconds': parse_seconds,
+            'visit_seconds': visit_seconds,
+            'lines_per_second': files * seed_lines / (parse_seconds + visit_seconds),
+        })
+
+    sizes = [run['lines'] for run in runs]
+    total = [run['parse_seconds'] + run['visit_seconds'] for run in runs]
+    return {
+        'runs': runs,
+        'fit': fit_complexity(sizes, total)['best_fit'],
+        'visit_fit': fit_complexity(sizes, [run['visit_seconds'] for run in runs])['best_fit'],
+        'estimated_seconds_per_million_lines': 1000000 * sum(total) / sum(sizes),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Find performance anti-patterns in Python files")
+    parser.add_argument('paths', nargs='+', help="Python source files to analyze")
+    parser.add_argument('--max-loop-depth', type=int, default=3, help="Deepest loop nest allowed")
+    args = parser.parse_args(argv)
+
+    found = False
+    for path in args.paths:
+        with open(path, encoding='utf-8') as f:
+            source = f.read()
+        for finding in detect_anti_patterns(source, path, args.max_loop_depth):
+            found = True
+            print(json.dumps(dict(finding, path=path)))
+    return 1 if found else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,329 @@
+"""
+Python Batch Executor
+Process-pool execution of PerformanceAntiPatterns workloads over shared-memory numeric inputs
+"""
+
+import os
+import pickle
+import time
+from array import array
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from multiprocessing import shared_memory
+
+from MemoryAndPerformance import PerformanceAntiPatterns
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional; inputs fall back to array('q') / array('d')
+    np = None
+
+# SHARED ARRAYS
+
+_INT64_MAX = (1 << 63) - 1
+
+
+def _numeric_array(values, typecode=None):
+    """(buffer, typecode) with values as flat int64 ('q') or float64 ('d'), or None if they do not fit
+
+    Lists and other sequences qualify only when every item is an int in int64 range or every
+    item is a float; anything else would come back from a worker as a different value.
+    """
+    if typecode is not None:
+        return array(typecode, values), typecode
+    if np is not None and isinstance(values, np.ndarray):
+        kind = values.dtype.kind
+        if kind == 'f' and values.dtype.itemsize <= 8:
+            return np.ascontiguousarray(values, dtype=np.float64).ravel(), 'd'
+        if kind == 'i' or (kind == 'u' and (values.dtype.itemsize < 8 or not values.size
+                                            or int(values.max()) <= _INT64_MAX)):
+            return np.ascontiguousarray(values, dtype=np.int64).ravel(), 'q'
+        return None
+    if isinstance(values, array):
+        if values.typecode in ('q', 'd'):
+            return values, values.typecode
+        if values.typecode == 'f':
+            return array('d', values), 'd'
+        if values.typecode in ('u', 'w'):
+            return None
+        if values.typecode in ('L', 'Q') and values and max(values) > _INT64_MAX:
+            return None
+        return array('q', values), 'q'
+
+    if all(type(value) is float for value in values):
+        return array('d', values), 'd'
+    if all(type(value) is int for value in values):
+        try:
+            return array('q', values), 'q'
+        except OverflowError:
+            return None
+    return None
+
+
+class SharedArray:
+    """Numeric input copied once into shared memory; workers attach by name instead of unpickling it"""
+
+    def __init__(self, values, typecode=None):
+        numeric = _numeric_array(values, typecode)
+        if numeric is None:
+            raise ValueError("SharedArray needs int64 or float64 values")
+        values, self.typecode = numeric
+        source = memoryview(values).cast('B')
+        self.length = len(values)
+        self._shm = shared_memory.SharedMemory(create=True, size=max(source.nbytes, 1))
+        self._shm.buf[:source.nbytes] = source
+
+    @property
+    def name(self):
+        return self._shm.name
+
+    def descriptor(self):
+        """Everything a worker needs to attach: a few dozen bytes whatever the input size"""
+        return (self._shm.name, self.typecode, self.length)
+
+    def close(self):
+        if self._shm is not None:
+            self._shm.close()
+            self._shm.unlink()
+            self._shm = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+# Per-process attachments, so tasks over the same input map it once per worker
+_attached = {}
+
+
+def _attach(name, typecode, length):
+    entry = _attached.get(name)
+    if entry is None:
+        # A new input means earlier ones are finished; drop their mappings
+        for shm, view in _attached.values():
+            view.release()
+            try:
+                shm.close()
+            except BufferError:
+                pass  # A result still holds a slice; the mapping goes when that does
+        _attached.clear()
+
+        shm = shared_memory.SharedMemory(name=name)
+        view = shm.buf[:length * 8].cast(typecode)  # The segment may be rounded up to a page
+        entry = _attached[name] = (shm, view)
+    return entry[1]
+
+
+def _run_range(payload):
+    """Worker side: unpack one task, run it over its range and return the pickled result"""
+    started = time.perf_counter()
+    (kind, source), func, start, stop, args = pickle.loads(payload)
+    if kind == 'shared':
+        view = _attach(*source)
+    elif kind == 'buffer':
+        view = memoryview(source)
+    else:
+        view = source  # A plain sequence that has no numeric buffer form
+    loaded = time.perf_counter()
+
+    result = func(view, start, stop, *args)
+    computed = time.perf_counter()
+
+    data = pickle.dumps(result, pickle.HIGHEST_PROTOCOL)
+    return data, computed - loaded, (loaded - started) + (time.perf_counter() - computed)
+
+# BATCH EXECUTOR
+
+class BatchExecutor:
+    """Splits a range across worker processes and yields each chunk's result in input order"""
+
+    def __init__(self, workers=None, chunks_per_worker=4, share_inputs=True):
+        self.workers = workers or os.cpu_count() or 1
+        self.chunks_per_worker = chunks_per_worker
+        self.share_inputs = share_inputs
+        self.stats = {}
+        self._pool = None
+
+    def start(self):
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(max_workers=self.workers)
+        return self
+
+    def shutdown(self):
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.shutdown()
+
+    def ranges(self, count):
+        """Near-equal consecutive (start, stop) ranges covering range(count)"""
+        chunks = max(1, min(count, self.workers * self.chunks_per_worker))
+        size, extra = divmod(count, chunks)
+        start = 0
+        for chunk in range(chunks):
+            stop = start + size + (chunk < extra)
+            yield start, stop
+            start = stop
+
+    def map_ranges(self, func, data, count=None, args=()):
+        """Yield func(view, start, stop, *args) for consecutive ranges of count, in order
+
+        func runs in a worker with view being all of data, so it must be importable for
+        pickling. Chunks finishing early wait in a reorder buffer until their turn.
+        """
+        shared = data if isinstance(data, SharedArray) else None
+        owned = False
+        if shared is None:
+            if not isinstance(data, (array, list, tuple)) and not (
+                    np is not None and isinstance(data, np.ndarray)):
+                data = list(data)  # Iterated more than once below
+            numeric = _numeric_array(data)
+            if numeric is not None and self.share_inputs:
+                shared = SharedArray(*numeric)
+                owned = True
+        if shared is not None:
+            source = ('shared', shared.descriptor())
+            length = shared.length
+        elif numeric is not None:
+            source = ('buffer', numeric[0])  # Pickled whole into every task
+            length = len(numeric[0])
+        else:
+            source = ('objects', data)  # Ints beyond int64, mixed types and the like
+            length = len(data)
+        count = length if count is None else count
+
+        stats = self.stats = {'workers': self.workers, 'tasks': 0, 'input_bytes': 0, 'result_bytes': 0,
+                              'compute_seconds': 0.0, 'serialization_seconds': 0.0}
+        self.start()
+        try:
+            futures = {}
+            for index, (start, stop) in enumerate(self.ranges(count)):
+                started = time.perf_counter()
+                payload = pickle.dumps((source, func, start, stop, args), pickle.HIGHEST_PROTOCOL)
+                stats['serialization_seconds'] += time.perf_counter() - started
+                stats['input_bytes'] += len(payload)
+                stats['tasks'] += 1
+                futures[self._pool.submit(_run_range, payload)] = index
+
+            finished = {}
+            next_index = 0
+            for future in as_completed(futures):
+                data_bytes, compute_seconds, worker_serialization = future.result()
+                started = time.perf_counter()
+                finished[futures.pop(future)] = pickle.loads(data_bytes)
+                stats['serialization_seconds'] += worker_serialization + time.perf_counter() - started
+                stats['compute_seconds'] += compute_seconds
+                stats['result_bytes'] += len(data_bytes)
+
+                while next_index in finished:
+                    yield finished.pop(next_index)
+                    next_index += 1
+        finally:
+            for future in futures:
+                future.cancel()
+            if owned:
+                shared.close()
+
+    def run(self, func, data, count=None, args=(), merge=None):
+        """All chunk results merged in order: concatenated lists by default, or merge(results)"""
+        results = self.map_ranges(func, data, count, args)
+        if merge is not None:
+            return merge(results)
+        merged = []
+        for result in results:
+            merged.extend(result)
+        return merged
+
+# WORKLOADS
+
+def _items(view, start, stop):
+    """Items start..stop as a list, whether view is a numeric buffer or a plain sequence"""
+    chunk = view[start:stop]
+    return chunk.tolist() if isinstance(chunk, memoryview) else list(chunk)
+
+
+def _empty_range(view, start, stop):
+    return []
+
+
+def expensive_operations_range(view, start, stop):
+    """repeated_expensive_operations over items[start:stop]"""
+    return PerformanceAntiPatterns().repeated_expensive_operations(_items(view, start, stop))
+
+
+def equal_value_matches_range(view, start, stop, n):
+    """Rows start..stop of nested_loop_inefficiency's O(n^4) scan over a flat n*n matrix"""
+    matrix = [_items(view, row * n, (row + 1) * n) for row in range(n)]
+    matches = 0
+    for i in range(start, stop):
+        for j in range(n):
+            for k in range(n):
+                for l in range(n):
+                    if matrix[i][j] == matrix[k][l]:
+                        matches += 1
+    return matches
+
+
+def parallel_expensive_operations(items, executor=None):
+    """Same results as repeated_expensive_operations(items), computed across processes"""
+    if executor is not None:
+        return executor.run(expensive_operations_range, items)
+    with BatchExecutor() as executor:
+        return executor.run(expensive_operations_range, items)
+
+
+def parallel_nested_loop_count(n=1000, executor=None):
+    """Same count as nested_loop_inefficiency(n), with its row ranges spread across processes"""
+    matrix = array('q', (i + j for i in range(n) for j in range(n)))
+    if executor is not None:
+        return executor.run(equal_value_matches_range, matrix, n, (n,), merge=sum)
+    with BatchExecutor() as executor:
+        return executor.run(equal_value_matches_range, matrix, n, (n,), merge=sum)
+
+
+def benchmark_batch_executor(workers=None, items=10000, n=60):
+    """Speedup and serialization overhead for 1..N workers, shared against pickled inputs"""
+    if workers is None:
+        workers = tuple(range(1, max(os.cpu_count() or 1, 2) + 1))
+    anti_patterns = PerformanceAntiPatterns()
+    values = list(range(items))
+
+    workloads = [
+        ('repeated_expensive_operations', lambda: anti_patterns.repeated_expensive_operations(values),
+         lambda executor: parallel_expensive_operations(values, executor)),
+        ('nested_loop_inefficiency', lambda: anti_patterns.nested_loop_inefficiency(n),
+         lambda executor: parallel_nested_loop_count(n, executor)),
+    ]
+
+    report = {'cpu_count': os.cpu_count(), 'items': items, 'n': n, 'workloads': []}
+    for name, serial, parallel in workloads:
+        started = time.perf_counter()
+        expected = serial()
+        serial_seconds = time.perf_counter() - started
+        runs = []
+
+        for count in workers:
+            for share_inputs in (True, False):
+                with BatchExecutor(count, share_inputs=share_inputs) as executor:
+                    started = time.perf_counter()
+                    executor.run(_empty_range, [0])  # Fork the workers untimed
+                    startup = time.perf_counter() - started
+
+                    started = time.perf_counter()
+                    result = parallel(executor)
+                    seconds = time.perf_counter() - started
+
+                if result != expected:
+                    raise ValueError(f"{name} with {count} workers disagrees with the serial run")
+                runs.append(dict(executor.stats, share_inputs=share_inputs, seconds=seconds,
+                                 startup_seconds=startup, speedup=serial_seconds / seconds))
+
+        report['workloads'].append({'workload': name, 'serial_seconds': serial_seconds, 'runs': runs})
+
+    return report
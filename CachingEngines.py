@@ -0,0 +1,260 @@
+"""
+Python Caching Engines
+Bounded replacements for the caches in MemoryAndPerformance.CachingIssues
+"""
+
+import sys
+import threading
+import time
+import weakref
+from collections import OrderedDict
+
+_MISSING = object()
+
+# BOUNDED CACHE
+
+class _Flight:
+    """A computation in progress that concurrent callers wait on"""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class BoundedCache:
+    """LRU cache bounded by entry count and estimated bytes, with optional TTL"""
+
+    def __init__(self, max_entries=1024, max_bytes=None, ttl=None, sizer=sys.getsizeof,
+                 clock=time.monotonic):
+        if max_entries is not None and max_entries <= 0:
+            raise ValueError("max_entries must be positive")
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.sizer = sizer
+        self.clock = clock
+
+        self._entries = OrderedDict()  # key -> (value, size, expires_at)
+        self._flights = {}
+        self._lock = threading.Lock()
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def _lookup(self, key):
+        """Return (found, value) and refresh recency; caller holds the lock"""
+        entry = self._entries.get(key)
+        if entry is None:
+            return False, None
+
+        value, size, expires_at = entry
+        if expires_at is not None and self.clock() >= expires_at:
+            del self._entries[key]
+            self.bytes -= size
+            self.expirations += 1
+            return False, None
+
+        self._entries.move_to_end(key)
+        return True, value
+
+    def _store(self, key, value):
+        """Insert and evict down to the bounds; caller holds the lock"""
+        size = self.sizer(value)
+        if self.max_bytes is not None and size > self.max_bytes:
+            return  # Would evict everything and still not fit
+
+        old = self._entries.pop(key, None)
+        if old is not None:
+            self.bytes -= old[1]
+
+        expires_at = self.clock() + self.ttl if self.ttl is not None else None
+        self._entries[key] = (value, size, expires_at)
+        self.bytes += size
+
+        while ((self.max_entries is not None and len(self._entries) > self.max_entries)
+               or (self.max_bytes is not None and self.bytes > self.max_bytes)):
+            _, (_, evicted_size, _) = self._entries.popitem(last=False)
+            self.bytes -= evicted_size
+            self.evictions += 1
+
+    def get(self, key, default=None):
+        with self._lock:
+            found, value = self._lookup(key)
+            if found:
+                self.hits += 1
+                return value
+            self.misses += 1
+            return default
+
+    def put(self, key, value):
+        with self._lock:
+            self._store(key, value)
+
+    def get_or_compute(self, key, compute):
+        """Return the cached value, running compute once even under concurrent misses"""
+        with self._lock:
+            found, value = self._lookup(key)
+            if found:
+                self.hits += 1
+                return value
+            self.misses += 1
+
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._flights[key] = _Flight()
+
+        if not leader:
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.result
+
+        try:
+            flight.result = compute()
+        except BaseException as e:
+            flight.error = e
+            raise
+        else:
+            with self._lock:
+                self._store(key, flight.result)
+            return flight.result
+        finally:
+            with self._lock:
+                del self._flights[key]
+            flight.done.set()
+
+    def invalidate(self, key):
+        with self._lock:
+            entry = self._entries.pop(key, None)
+            if entry is not None:
+                self.bytes -= entry[1]
+            return entry is not None
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.bytes = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key):
+        with self._lock:
+            return self._lookup(key)[0]
+
+    def stats(self):
+        with self._lock:
+            return {
+                'entries': len(self._entries),
+                'bytes': self.bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'expirations': self.expirations,
+            }
+
+# WEAK-VALUE CACHE
+
+class WeakDict(dict):
+    """dict subclass that can be weakly referenced"""
+    __slots__ = ('__weakref__',)
+
+
+class WeakList(list):
+    """list subclass that can be weakly referenced"""
+    __slots__ = ('__weakref__',)
+
+
+def make_weakrefable(obj):
+    """Wrap plain dicts and lists so they can live in a WeakValueDictionary"""
+    if type(obj) is dict:
+        return WeakDict(obj)
+    if type(obj) is list:
+        return WeakList(obj)
+    try:
+        weakref.ref(obj)
+    except TypeError:
+        raise TypeError(f"{type(obj).__name__} objects cannot be weakly referenced") from None
+    return obj
+
+
+class TwoTierCache:
+    """Strong-ref LRU tier in front of a weak-value tier for objects alive elsewhere"""
+
+    def __init__(self, strong_size=128):
+        self._strong = BoundedCache(max_entries=strong_size)
+        self._weak = weakref.WeakValueDictionary()
+        self._lock = threading.Lock()
+        self.strong_hits = 0
+        self.weak_hits = 0
+        self.misses = 0
+
+    def put(self, key, value):
+        value = make_weakrefable(value)
+        with self._lock:
+            self._weak[key] = value
+            self._strong.put(key, value)
+        return value
+
+    def get(self, key, default=None):
+        with self._lock:
+            value = self._strong.get(key, _MISSING)
+            if value is not _MISSING:
+                self.strong_hits += 1
+                return value
+
+            value = self._weak.get(key)
+            if value is None:
+                self.misses += 1
+                return default
+
+            # Still alive elsewhere; promote so it survives its other owners
+            self.weak_hits += 1
+            self._strong.put(key, value)
+            return value
+
+    def get_or_create(self, key, factory):
+        value = self.get(key, _MISSING)
+        if value is _MISSING:
+            value = self.put(key, factory())
+        return value
+
+    def __len__(self):
+        return len(self._weak)
+
+    def stats(self):
+        with self._lock:
+            lookups = self.strong_hits + self.weak_hits + self.misses
+            return {
+                'strong_entries': len(self._strong),
+                'weak_entries': len(self._weak),
+                'strong_hits': self.strong_hits,
+                'weak_hits': self.weak_hits,
+                'misses': self.misses,
+                'hit_rate': (self.strong_hits + self.weak_hits) / lookups if lookups else 0.0,
+            }
+
+# PROPER CACHING
+
+class ProperCaching:
+
+    _cache = BoundedCache(max_entries=1024, max_bytes=64 * 1024 * 1024)
+
+    def bounded_cache(self, key, expensive_operation):
+        """Bounded, single-flight replacement for CachingIssues.unbounded_cache"""
+        # The result is stored once rather than amplified 10,000x
+        return self._cache.get_or_compute(key, expensive_operation)
+
+    def weak_reference_caching(self, strong_size=100):
+        """Two-tier replacement for CachingIssues.weak_reference_misuse"""
+        cache = TwoTierCache(strong_size=strong_size)
+
+        for i in range(1000):
+            cache.put(i, {'data': list(range(1000)), 'id': i})
+
+        # Only the most recent strong_size objects are kept alive by the cache
+        return cache
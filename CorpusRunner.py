@@ -0,0 +1,304 @@
+"""
+Python Corpus Runner
+Parallel analysis of the test corpus with a content-hash result cache and streamed results
+"""
+
+import argparse
+import hashlib
+import inspect
+import json
+import os
+import re
+import shutil
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from AntiPatternDetector import detect_anti_patterns
+from SyntaxChecker import SyntaxChecker
+
+# ANALYZERS
+
+class Analyzer:
+    """Named, versioned analysis for a set of file extensions; a new version invalidates cached results"""
+
+    def __init__(self, name, version, extensions, func):
+        self.name = name
+        self.version = version
+        self.extensions = frozenset(extensions)
+        self.func = func  # func(source) -> list of issue dicts; must be importable for pickling
+
+
+def source_version(*objects):
+    """Digest of the source files defining objects, so editing an analyzer invalidates its results"""
+    digest = hashlib.sha256()
+    for path in sorted({os.path.abspath(inspect.getsourcefile(obj)) for obj in objects}):
+        with open(path, 'rb') as f:
+            digest.update(f.read())
+    return digest.hexdigest()[:16]
+
+
+def check_python_syntax(source):
+    return SyntaxChecker().check(source)
+
+
+_C_LIKE_TOKEN = re.compile(r"""
+    //[^\n]* | /\*.*?\*/
+  | "(?:[^"\\\n]|\\.)*" | '(?:[^'\\\n]|\\.)*' | `(?:[^`\\]|\\.)*`
+  | [()\[\]{}] | \n
+""", re.VERBOSE | re.DOTALL)
+_PAIRS = {')': '(', ']': '[', '}': '{'}
+
+
+def check_bracket_balance(source):
+    """Unmatched brackets in Java/TypeScript/JavaScript, skipping comments and literals"""
+    issues = []
+    stack = []  # (char, line, column)
+    line = 1
+    line_start = 0
+
+    for match in _C_LIKE_TOKEN.finditer(source):
+        text = match.group()
+        if text in '([{':
+            stack.append((text, line, match.start() - line_start + 1))
+        elif text in _PAIRS:
+            column = match.start() - line_start + 1
+            if not stack:
+                issues.append({'line': line, 'column': column, 'severity': 'error',
+                               'message': f"unmatched '{text}'"})
+            elif stack[-1][0] != _PAIRS[text]:
+                opener, opened_line, _ = stack.pop()
+                issues.append({'line': line, 'column': column, 'severity': 'error',
+                               'message': f"'{text}' does not match '{opener}' on line {opened_line}"})
+            else:
+                stack.pop()
+        elif '\n' in text:
+            line += text.count('\n')
+            line_start = match.start() + text.rindex('\n') + 1
+
+    for opener, opened_line, column in stack:
+        issues.append({'line': opened_line, 'column': column, 'severity': 'error',
+                       'message': f"'{opener}' was never closed"})
+    issues.sort(key=lambda issue: (issue['line'], issue['column']))
+    return issues
+
+
+ANALYZERS = [
+    Analyzer('python_syntax', source_version(check_python_syntax, SyntaxChecker),
+             ('.py',), check_python_syntax),
+    Analyzer('python_anti_patterns', source_version(detect_anti_patterns),
+             ('.py',), detect_anti_patterns),
+    Analyzer('bracket_balance', source_version(check_bracket_balance),
+             ('.java', '.ts', '.js'), check_bracket_balance),
+]
+
+
+def register_analyzer(name, version, extensions, func):
+    """Add an analyzer; version=None derives it from the source file defining func"""
+    if version is None:
+        version = source_version(func)
+    analyzer = Analyzer(name, version, extensions, func)
+    ANALYZERS.append(analyzer)
+    return analyzer
+
+# RESULT CACHE
+
+class ResultCache:
+    """On-disk results keyed by file content hash plus analyzer name and version"""
+
+    def __init__(self, directory):
+        self.directory = directory
+
+    @staticmethod
+    def key(content, analyzer):
+        digest = hashlib.sha256(content)
+        digest.update(f"\0{analyzer.name}\0{analyzer.version}".encode())
+        return digest.hexdigest()
+
+    def _path(self, key):
+        return os.path.join(self.directory, key[:2], key + '.json')
+
+    def get(self, key):
+        try:
+            with open(self._path(key), encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None  # Missing or torn entries are simply recomputed
+
+    def put(self, key, issues):
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # Write then rename so a concurrent reader never sees a partial entry
+        fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(issues, f)
+            os.replace(temp_path, path)
+        except BaseException:
+            os.unlink(temp_path)
+            raise
+
+    def clear(self):
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+# CORPUS RUNNER
+
+def _run_analyzer(func, content):
+    started = time.perf_counter()
+    issues = func(content.decode('utf-8', errors='replace'))
+    return issues, time.perf_counter() - started
+
+
+class CorpusRunner:
+    """Fans files out across a process pool, skipping any whose cached results are current"""
+
+    def __init__(self, cache_dir='.analysis_cache', workers=None, analyzers=None, use_cache=True):
+        self.cache = ResultCache(cache_dir) if use_cache else None
+        self.workers = workers or os.cpu_count() or 1
+        self.analyzers = ANALYZERS if analyzers is None else analyzers
+        self.stats = {'files': 0, 'analyzed': 0, 'cached': 0, 'failed': 0}
+
+    def _analyzers_for(self, path):
+        extension = os.path.splitext(path)[1]
+        return [analyzer for analyzer in self.analyzers if extension in analyzer.extensions]
+
+    def discover(self, paths):
+        """Files under paths that at least one analyzer handles, in a stable order"""
+        files = []
+        for path in paths:
+            if os.path.isfile(path):
+                files.append(path)
+                continue
+            for root, dirs, names in os.walk(path):
+                dirs[:] = sorted(d for d in dirs if not d.startswith('.') and d != '__pycache__')
+                files.extend(os.path.join(root, name) for name in sorted(names))
+        return [path for path in files if self._analyzers_for(path)]
+
+    def run(self, paths):
+        """Yield one result dict per (file, analyzer) as soon as it is available"""
+        pending = []
+        for path in self.discover(paths):
+            with open(path, 'rb') as f:
+                content = f.read()
+            self.stats['files'] += 1
+
+            for analyzer in self._analyzers_for(path):
+                key = ResultCache.key(content, analyzer)
+                issues = self.cache.get(key) if self.cache is not None else None
+                if issues is not None:
+                    self.stats['cached'] += 1
+                    yield self._result(path, analyzer, key, issues, cached=True)
+                else:
+                    pending.append((path, analyzer, key, content))
+
+        if not pending:
+            return  # Fully cached runs never pay for starting worker processes
+        if self.workers == 1 or len(pending) == 1:
+            for path, analyzer, key, content in pending:
+                yield self._finish(path, analyzer, key, lambda: _run_analyzer(analyzer.func, content))
+            return
+
+        with ProcessPoolExecutor(max_workers=min(self.workers, len(pending))) as executor:
+            futures = {
+                executor.submit(_run_analyzer, analyzer.func, content): (path, analyzer, key)
+                for path, analyzer, key, content in pending
+            }
+            del pending  # File contents now live only in the submitted work items
+            for future in as_completed(futures):
+                path, analyzer, key = futures.pop(future)
+                yield self._finish(path, analyzer, key, future.result)
+
+    def _finish(self, path, analyzer, key, outcome):
+        try:
+            issues, seconds = outcome()
+        except Exception as e:
+            self.stats['failed'] += 1
+            result = self._result(path, analyzer, key, [], cached=False)
+            result['error'] = f"{type(e).__name__}: {e}"
+            return result
+
+        self.stats['analyzed'] += 1
+        if self.cache is not None:
+            self.cache.put(key, issues)
+        result = self._result(path, analyzer, key, issues, cached=False)
+        result['seconds'] = seconds
+        return result
+
+    @staticmethod
+    def _result(path, analyzer, key, issues, cached):
+        return {
+            'path': path,
+            'analyzer': analyzer.name,
+            'version': analyzer.version,
+            'digest': key,
+            'cached': cached,
+            'issues': issues,
+        }
+
+
+def benchmark_corpus_runner(copies=20, workers=(1, 2, 4)):
+    """Cold, warm and partially-changed runs over copies of the fixture corpus"""
+    source_dir = os.path.dirname(os.path.abspath(__file__))
+    fixtures = [name for name in sorted(os.listdir(source_dir))
+                if os.path.splitext(name)[1] in ('.py', '.java', '.ts', '.js')]
+    report = {'files': len(fixtures) * copies, 'runs': []}
+
+    with tempfile.TemporaryDirectory() as scratch:
+        corpus = os.path.join(scratch, 'corpus')
+        for copy in range(copies):
+            target = os.path.join(corpus, f"copy_{copy}")
+            os.makedirs(target)
+            for name in fixtures:
+                with open(os.path.join(source_dir, name), 'rb') as f:
+                    content = f.read()
+                # A per-copy trailer keeps every copy's content hash distinct
+                comment = b'#' if name.endswith('.py') else b'//'
+                with open(os.path.join(target, name), 'wb') as f:
+                    f.write(content + b'\n' + comment + f" copy {copy}\n".encode())
+
+        def timed(label, runner):
+            started = time.perf_counter()
+            first = None
+            for _ in runner.run([corpus]):
+                if first is None:
+                    first = time.perf_counter() - started
+            report['runs'].append(dict(runner.stats, run=label, workers=runner.workers,
+                                       seconds=time.perf_counter() - started,
+                                       first_result_seconds=first))
+
+        for count in workers:
+            cache_dir = os.path.join(scratch, f"cache_{count}")
+            timed('cold', CorpusRunner(cache_dir, workers=count))
+
+        cache_dir = os.path.join(scratch, f"cache_{workers[-1]}")
+        timed('warm', CorpusRunner(cache_dir, workers=workers[-1]))
+
+        # Change one copy in ten; only those files should be re-analyzed
+        for copy in range(0, copies, 10):
+            target = os.path.join(corpus, f"copy_{copy}")
+            for name in fixtures:
+                with open(os.path.join(target, name), 'ab') as f:
+                    f.write(b'\n')
+        timed('incremental', CorpusRunner(cache_dir, workers=workers[-1]))
+
+    return report
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Analyze a corpus in parallel with cached results")
+    parser.add_argument('paths', nargs='+', help="Files or directories to analyze")
+    parser.add_argument('--cache-dir', default='.analysis_cache', help="Result cache directory")
+    parser.add_argument('--workers', type=int, default=None, help="Worker processes")
+    parser.add_argument('--no-cache', action='store_true', help="Re-analyze every file")
+    args = parser.parse_args(argv)
+
+    runner = CorpusRunner(args.cache_dir, workers=args.workers, use_cache=not args.no_cache)
+    for result in runner.run(args.paths):
+        print(json.dumps(result), flush=True)
+    print(json.dumps(runner.stats), file=sys.stderr)
+    return 1 if runner.stats['failed'] else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,311 @@
+"""
+Python Event Bus
+Listener registry with weak handlers and per-event payloads, replacing
+MemoryLeakExamples.accumulate_event_listeners
+"""
+
+import asyncio
+import inspect
+import itertools
+import threading
+import time
+import tracemalloc
+import weakref
+from collections import deque
+
+from ResourcePools import WorkerPool, current_rss
+
+# SUBSCRIPTIONS
+
+class Subscription:
+    """Handle returned by EventBus.subscribe; unsubscribes on close or context exit"""
+
+    __slots__ = ('_bus', 'event', 'token', '__weakref__')
+
+    def __init__(self, bus, event, token):
+        self._bus = bus
+        self.event = event
+        self.token = token
+
+    @property
+    def active(self):
+        return self._bus is not None and self._bus._has(self.event, self.token)
+
+    def unsubscribe(self):
+        if self._bus is not None:
+            self._bus._remove(self.event, self.token)
+            self._bus = None
+
+    close = unsubscribe
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.unsubscribe()
+
+# EVENT BUS
+
+class _HandlerRef(weakref.ref):
+    """Weak reference to a handler (or a bound method's owner) that knows its slot"""
+
+    __slots__ = ('event', 'token', 'func')
+
+    def __new__(cls, target, callback, event, token, func=None):
+        return super().__new__(cls, target, callback)
+
+    def __init__(self, target, callback, event, token, func=None):
+        super().__init__(target, callback)
+        self.event = event
+        self.token = token
+        self.func = func
+
+    def resolve(self):
+        """The callable handler, or None once its target has been collected"""
+        target = self()
+        if target is None or self.func is None:
+            return target
+        return self.func.__get__(target)
+
+
+class EventBus:
+    """Publish/subscribe registry; bound-method handlers are held weakly by default"""
+
+    def __init__(self, error_history=100):
+        self._handlers = {}  # event -> {token: handler or _HandlerRef}
+        self._tokens = itertools.count()
+        self._lock = threading.Lock()
+        # Filled by weakref callbacks, drained under the lock; list.append needs no lock
+        self._pending_removals = []
+        # One shared callback rather than a closure per weak subscription
+        self._on_collected = self._collected
+        self.errors = deque(maxlen=error_history)
+        self.delivered = 0
+
+    def subscribe(self, event, handler, weak=None):
+        """Register handler(payload); weak=None means weak only for bound methods"""
+        if weak is None:
+            weak = inspect.ismethod(handler)
+        token = next(self._tokens)
+
+        if not weak:
+            entry = handler
+        elif inspect.ismethod(handler):
+            # Reference the owner weakly and keep the plain function strongly
+            entry = _HandlerRef(handler.__self__, self._on_collected, event, token, handler.__func__)
+        else:
+            entry = _HandlerRef(handler, self._on_collected, event, token)
+
+        with self._lock:
+            removed = self._purge()
+            self._handlers.setdefault(event, {})[token] = entry
+        del removed
+        return Subscription(self, event, token)
+
+    def _collected(self, ref):
+        # Runs wherever the handler's owner dies, possibly while this thread holds _lock
+        # (dropping a strong handler can free it), so it must not take the lock itself
+        self._pending_removals.append((ref.event, ref.token))
+
+    def _pop(self, event, token):
+        """Unlink one entry and return it; caller holds the lock and drops it after releasing"""
+        handlers = self._handlers.get(event)
+        if handlers is None:
+            return None
+        entry = handlers.pop(token, None)
+        if not handlers:
+            del self._handlers[event]
+        return entry
+
+    def _purge(self):
+        """Apply removals queued by weakref callbacks; caller holds the lock"""
+        removed = []
+        pending = self._pending_removals
+        while pending:
+            removed.append(self._pop(*pending.pop()))
+        return removed
+
+    def _remove(self, event, token):
+        with self._lock:
+            removed = self._purge()
+            removed.append(self._pop(event, token))
+        # Freeing entries can run finalizers and weakref callbacks; never under the lock
+        del removed
+
+    def _has(self, event, token):
+        with self._lock:
+            removed = self._purge()
+            found = token in self._handlers.get(event, ())
+        del removed
+        return found
+
+    def _live_handlers(self, event):
+        with self._lock:
+            removed = self._purge()
+            entries = list(self._handlers.get(event, {}).values())
+        del removed
+        handlers = []
+        for entry in entries:
+            if isinstance(entry, _HandlerRef):
+                entry = entry.resolve()
+                if entry is None:
+                    continue
+            handlers.append(entry)
+        return handlers
+
+    def listener_count(self, event=None):
+        with self._lock:
+            removed = self._purge()
+            if event is not None:
+                count = len(self._handlers.get(event, ()))
+            else:
+                count = sum(len(handlers) for handlers in self._handlers.values())
+        del removed
+        return count
+
+    def _call_all(self, event, handlers, payload):
+        delivered = 0
+        for handler in handlers:
+            try:
+                handler(payload)
+            except Exception as e:
+                self.errors.append((event, handler, e))
+            else:
+                delivered += 1
+        return delivered
+
+    def publish(self, event, payload=None):
+        """Deliver one shared payload to every handler in this thread"""
+        delivered = self._call_all(event, self._live_handlers(event), payload)
+        self.delivered += delivered
+        return delivered
+
+    def publish_threaded(self, event, payload=None, executor=None, chunk_size=1024):
+        """Fan handlers out across an executor in chunks; returns the total delivered"""
+        handlers = self._live_handlers(event)
+        chunks = [handlers[i:i + chunk_size] for i in range(0, len(handlers), chunk_size)]
+
+        owned = executor is None
+        if owned:
+            executor = WorkerPool(max_workers=4, name='EventBus')
+        try:
+            futures = [executor.submit(self._call_all, event, chunk, payload) for chunk in chunks]
+            delivered = sum(future.result() for future in futures)
+        finally:
+            if owned:
+                executor.shutdown()
+
+        self.delivered += delivered
+        return delivered
+
+    async def publish_async(self, event, payload=None, chunk_size=1024):
+        """Deliver on the running loop, awaiting coroutine handlers concurrently"""
+        delivered = 0
+        pending = []
+
+        for index, handler in enumerate(self._live_handlers(event)):
+            try:
+                result = handler(payload)
+            except Exception as e:
+                self.errors.append((event, handler, e))
+                continue
+            if inspect.isawaitable(result):
+                pending.append((handler, result))
+            else:
+                delivered += 1
+            if index % chunk_size == chunk_size - 1:
+                await asyncio.sleep(0)  # Let other tasks run during very large fan-outs
+
+        results = await asyncio.gather(*(awaitable for _, awaitable in pending),
+                                       return_exceptions=True)
+        for (handler, _), result in zip(pending, results):
+            if isinstance(result, Exception):
+                self.errors.append((event, handler, result))
+            else:
+                delivered += 1
+
+        self.delivered += delivered
+        return delivered
+
+# PROPER EVENT HANDLING
+
+class ProperEventHandling:
+
+    def registered_event_listeners(self, bus, count=1000):
+        """Replacement for accumulate_event_listeners: payload is passed per event"""
+        subscriptions = []
+
+        for i in range(count):
+            def listener(payload, listener_id=i):
+                return f"Processed {listener_id} with {len(payload)} items"
+
+            subscriptions.append(bus.subscribe('data', listener))
+
+        # Callers publish the data once per event: bus.publish('data', list(range(10000)))
+        return subscriptions
+
+
+class _Owner:
+    """Listener owner whose bound method is registered weakly"""
+
+    __slots__ = ('hits', '__weakref__')
+
+    def __init__(self):
+        self.hits = 0
+
+    def on_event(self, payload):
+        self.hits += 1
+
+
+def benchmark_event_bus(listeners=100000, events=5, workers=4):
+    """Dispatch throughput and resident memory for a bus with many weak listeners"""
+    def populate():
+        bus = EventBus()
+        owners = [_Owner() for _ in range(listeners)]
+        subscriptions = [bus.subscribe('tick', owner.on_event) for owner in owners]
+        return bus, owners, subscriptions
+
+    # Python-level bytes are traced on a throwaway build; tracing would skew RSS and timings
+    tracemalloc.start()
+    try:
+        traced = populate()
+        registry_bytes, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    del traced
+
+    baseline_rss = current_rss()
+    bus, owners, subscriptions = populate()
+    rss_with_listeners = current_rss()
+
+    payload = list(range(10000))  # Built once per event, not once per listener
+    report = {'listeners': listeners, 'events': events}
+
+    started = time.perf_counter()
+    for _ in range(events):
+        bus.publish('tick', payload)
+    report['sync_calls_per_second'] = listeners * events / (time.perf_counter() - started)
+
+    with WorkerPool(max_workers=workers) as pool:
+        started = time.perf_counter()
+        for _ in range(events):
+            bus.publish_threaded('tick', payload, executor=pool)
+        report['threaded_calls_per_second'] = listeners * events / (time.perf_counter() - started)
+
+    async def dispatch():
+        for _ in range(events):
+            await bus.publish_async('tick', payload)
+
+    started = time.perf_counter()
+    asyncio.run(dispatch())
+    report['async_calls_per_second'] = listeners * events / (time.perf_counter() - started)
+
+    # Dropping the owners must empty the registry without any unsubscribe calls
+    del owners
+    report['listeners_after_owners_dropped'] = bus.listener_count()
+    report['registry_bytes'] = registry_bytes
+    report['bytes_per_listener'] = registry_bytes / listeners
+    report['rss_growth'] = (rss_with_listeners - baseline_rss
+                            if rss_with_listeners is not None and baseline_rss is not None else None)
+    del subscriptions
+    return report
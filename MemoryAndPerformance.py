@@ -349,6 +349,22 @@ class ProperResourceManagement:
         
         return f"Collected {collected} objects"
     
+    def instrumented_garbage_collection(self, policy=None):
+        """Garbage collection with pause timing and an optional collection policy"""
+        from MonitoringTools import GCMonitor, GCPolicy
+        
+        policy = policy or GCPolicy()
+        with policy, GCMonitor() as monitor:
+            # Create some objects with potential cycles, dropped at once so a
+            # single timed collection is enough
+            self.create_circular_references()
+            collected = gc.collect()
+        
+        return {
+            'collected': collected,
+            'gc_report': monitor.report()
+        }
+    
     def create_circular_references(self):
         """Helper method that creates circular references"""
         obj1 = {'name': 'obj1'}
@@ -374,12 +390,14 @@ class MemoryMonitoring:
         
         # Get memory usage
         current, peak = tracemalloc.get_traced_memory()
+        snapshot = tracemalloc.take_snapshot()
         tracemalloc.stop()
         
         return {
             'result': result,
             'current_memory': current,
-            'peak_memory': peak
+            'peak_memory': peak,
+            'live_blocks': sum(stat.count for stat in snapshot.statistics('filename'))
         }
     
     def profile_function_performance(self, func, *args, **kwargs):
@@ -405,6 +423,21 @@ class MemoryMonitoring:
             'result': result,
             'profile_stats': stats_buffer.getvalue()
         }
+    
+    def profile_function_sampling(self, func, *args, **kwargs):
+        """Profile function performance with a low-overhead sampling profiler"""
+        from MonitoringTools import SamplingProfiler
+        
+        profiler = SamplingProfiler()
+        with profiler:
+            result = func(*args, **kwargs)
+        
+        return {
+            'result': result,
+            'profile_stats': profiler.collapsed(),
+            'samples': profiler.sample_count,
+            'overhead': profiler.overhead()
+        }
 
 # Example usage and testing
 if __name__ == "__main__":
@@ -0,0 +1,494 @@
+"""
+Python Memory-Efficient Structures
+Compact replacements for the ad-hoc structures in MemoryAndPerformance.py
+"""
+
+import itertools
+import sys
+import threading
+import time
+import tracemalloc
+import weakref
+from array import array
+from collections import deque
+
+from MemoryAndPerformance import MemoryLeakExamples, ProperResourceManagement
+from MonitoringTools import reachable_size
+
+# SLOTTED TREE NODES
+
+class TreeNode:
+    """Slotted tree node with a weak parent link and first-child/next-sibling children"""
+
+    __slots__ = ('value', 'first_child', 'next_sibling', '_last_child', '_parent', '__weakref__')
+
+    def __init__(self, value):
+        self.value = value
+        self.first_child = None
+        self.next_sibling = None
+        self._last_child = None
+        self._parent = None
+
+    @property
+    def parent(self):
+        return self._parent() if self._parent is not None else None
+
+    def add_child(self, child):
+        """Append a child; only the parent holds strong references downward"""
+        if child._parent is not None:
+            raise ValueError("Node already has a parent")
+        child._parent = weakref.ref(self)
+        if self._last_child is None:
+            self.first_child = child
+        else:
+            self._last_child.next_sibling = child
+        self._last_child = child
+        return child
+
+    @property
+    def children(self):
+        return list(self.iter_children())
+
+    def iter_children(self):
+        child = self.first_child
+        while child is not None:
+            yield child
+            child = child.next_sibling
+
+    def iter_preorder(self):
+        """Iterative pre-order walk, safe for trees millions of nodes deep"""
+        stack = [self]
+        while stack:
+            node = stack.pop()
+            yield node
+            children = node.children
+            children.reverse()
+            stack.extend(children)
+
+    def __repr__(self):
+        return f"TreeNode({self.value!r})"
+
+# STRUCT-OF-ARRAYS TREE
+
+class ArrayTree:
+    """Tree stored as parallel index arrays; -1 marks a missing link"""
+
+    def __init__(self):
+        self.values = []
+        self.parent = array('q')
+        self.first_child = array('q')
+        self.next_sibling = array('q')
+        self.last_child = array('q')
+
+    @classmethod
+    def from_parents(cls, parents, values=None):
+        """Bulk build in O(n) from a parent index array (-1 for roots)"""
+        tree = cls()
+        count = len(parents)
+        tree.values = list(values) if values is not None else list(range(count))
+        if len(tree.values) != count:
+            raise ValueError("values and parents must have the same length")
+
+        tree.parent = array('q', parents)
+        tree.first_child = array('q', [-1]) * count
+        tree.next_sibling = array('q', [-1]) * count
+        tree.last_child = array('q', [-1]) * count
+
+        first_child = tree.first_child
+        next_sibling = tree.next_sibling
+        last_child = tree.last_child
+        # Walking backwards links each node's children in ascending index order
+        for node in range(count - 1, -1, -1):
+            parent = parents[node]
+            if parent < 0:
+                continue
+            if not 0 <= parent < count:
+                raise ValueError(f"Parent index {parent} out of range")
+            if first_child[parent] < 0:
+                last_child[parent] = node
+            next_sibling[node] = first_child[parent]
+            first_child[parent] = node
+
+        return tree
+
+    def add_node(self, value, parent=-1):
+        """Append a node in O(1) and return its index"""
+        index = len(self.values)
+        self.values.append(value)
+        self.parent.append(parent)
+        self.first_child.append(-1)
+        self.next_sibling.append(-1)
+        self.last_child.append(-1)
+
+        if parent >= 0:
+            last = self.last_child[parent]
+            if last < 0:
+                self.first_child[parent] = index
+            else:
+                self.next_sibling[last] = index
+            self.last_child[parent] = index
+
+        return index
+
+    def __len__(self):
+        return len(self.values)
+
+    def roots(self):
+        return [node for node, parent in enumerate(self.parent) if parent < 0]
+
+    def children(self, node):
+        result = []
+        child = self.first_child[node]
+        while child >= 0:
+            result.append(child)
+            child = self.next_sibling[child]
+        return result
+
+    def preorder(self, root=None):
+        """Yield node indices in pre-order without recursion"""
+        first_child = self.first_child
+        next_sibling = self.next_sibling
+        stack = [root] if root is not None else list(reversed(self.roots()))
+
+        while stack:
+            node = stack.pop()
+            yield node
+            sibling_run = []
+            child = first_child[node]
+            while child >= 0:
+                sibling_run.append(child)
+                child = next_sibling[child]
+            sibling_run.reverse()
+            stack.extend(sibling_run)
+
+    def depths(self):
+        """Depth of every node, computed in one pre-order pass"""
+        depth = array('q', [0]) * len(self)
+        parent = self.parent
+        for node in self.preorder():
+            if parent[node] >= 0:
+                depth[node] = depth[parent[node]] + 1
+        return depth
+
+    @classmethod
+    def from_nodes(cls, *roots):
+        """Flatten TreeNode trees into arrays, numbering nodes in pre-order"""
+        tree = cls()
+        for root in roots:
+            indices = {}
+            for node in root.iter_preorder():
+                parent = node.parent
+                indices[id(node)] = tree.add_node(
+                    node.value, indices[id(parent)] if node is not root else -1
+                )
+        return tree
+
+    def to_nodes(self):
+        """Rebuild slotted TreeNode objects; returns the list of roots"""
+        nodes = [TreeNode(value) for value in self.values]
+        roots = []
+        for index in self.preorder():
+            parent = self.parent[index]
+            if parent < 0:
+                roots.append(nodes[index])
+            else:
+                nodes[parent].add_child(nodes[index])
+        return roots
+
+# MEMORY COMPARISON
+
+def _heap_parents(count):
+    """Parent indices of a binary-heap-shaped tree"""
+    return [-1] + [(i - 1) // 2 for i in range(1, count)]
+
+
+def _build_linked(node_class, count):
+    nodes = [node_class(i) for i in range(count)]
+    for i, parent in enumerate(_heap_parents(count)):
+        if parent >= 0:
+            nodes[parent].add_child(nodes[i])
+    return nodes[0] if nodes else None
+
+
+def _walk_linked(root):
+    stack = [root]
+    while stack:
+        node = stack.pop()
+        yield node
+        stack.extend(node.children)
+
+
+def _traced_bytes(build):
+    tracemalloc.start()
+    try:
+        keep = build()
+        current, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    del keep
+    return current
+
+
+def measure_node_memory(count=10000):
+    """Bytes per node for the existing Node classes versus TreeNode and ArrayTree"""
+    leaking_node = type(MemoryLeakExamples().create_circular_references())
+    weak_parent_node = ProperResourceManagement().proper_circular_reference_handling()
+
+    # A list of every node keeps them alive while memory is read
+    def keep_all(node_class):
+        return lambda: list(_walk_linked(_build_linked(node_class, count)))
+
+    overhead = _traced_bytes(lambda: [None] * count)
+    builds = {
+        'MemoryLeakExamples.Node': keep_all(leaking_node),
+        'ProperResourceManagement.Node': keep_all(weak_parent_node),
+        'TreeNode': keep_all(TreeNode),
+    }
+
+    report = {name: (_traced_bytes(build) - overhead) / count for name, build in builds.items()}
+    report['ArrayTree'] = _traced_bytes(
+        lambda: ArrayTree.from_parents(_heap_parents(count))
+    ) / count
+    return report
+
+# GENERATIONAL REGISTRY
+
+class _Generation:
+
+    __slots__ = ('number', 'updated', 'tokens')
+
+    def __init__(self, number, updated):
+        self.number = number
+        self.updated = updated  # Time of the newest entry; the whole generation ages from it
+        self.tokens = set()
+
+
+class _RegistryEntry:
+
+    __slots__ = ('token', 'target', 'weak', 'data', 'generation')
+
+    def __init__(self, token, target, weak, data, generation):
+        self.token = token
+        self.target = target
+        self.weak = weak
+        self.data = data
+        self.generation = generation
+
+    def resolve(self):
+        return self.target() if self.weak else self.target
+
+
+class GenerationalRegistry:
+    """Bounded object registry with stable tokens and whole-generation eviction"""
+
+    def __init__(self, generation_size=10000, max_generations=8, max_age=None, clock=time.monotonic):
+        self.generation_size = generation_size
+        self.max_generations = max_generations
+        self.max_age = max_age
+        self.clock = clock
+
+        self._entries = {}  # token -> _RegistryEntry
+        self._by_id = {}  # id(obj) -> token, validated against the entry's target
+        self._generations = deque()
+        self._tokens = itertools.count()
+        self._generation_numbers = itertools.count()
+        self._lock = threading.RLock()
+        self._on_collected = self._collected
+        self.evicted = 0
+        self.collected = 0
+        self._new_generation()
+
+    def _new_generation(self):
+        self._generations.append(_Generation(next(self._generation_numbers), self.clock()))
+        while len(self._generations) > self.max_generations:
+            self._evict_generation(self._generations.popleft())
+
+    def _evict_generation(self, generation):
+        # Detach the token set first: freeing an entry can run _collected for another one
+        tokens, generation.tokens = generation.tokens, set()
+        for token in tokens:
+            if self._drop(token):
+                self.evicted += 1
+
+    def _drop(self, token):
+        """Unlink one entry; False when it was already gone (collected or unregistered)"""
+        entry = self._entries.pop(token, None)
+        if entry is None:
+            return False
+        # A dead referent's id may already belong to a new object, so match on our token
+        object_id = entry.target.object_id if entry.weak else id(entry.target)
+        if self._by_id.get(object_id) == token:
+            del self._by_id[object_id]
+        return True
+
+    def _leave_generation(self, entry):
+        for generation in self._generations:
+            if generation.number == entry.generation:
+                generation.tokens.discard(entry.token)
+                return
+
+    def _collected(self, ref):
+        with self._lock:
+            entry = self._entries.get(ref.token)
+            if entry is None:
+                return
+            self._leave_generation(entry)
+            if self._drop(ref.token):
+                self.collected += 1
+
+    def _expire(self):
+        if self.max_age is None:
+            return
+        deadline = self.clock() - self.max_age
+        while self._generations and self._generations[0].updated < deadline:
+            self._evict_generation(self._generations.popleft())
+        if not self._generations:
+            self._new_generation()
+
+    def register(self, obj, data=None, strong=False):
+        """Register obj (storing data once) and return its stable token
+
+        obj is held weakly, so its entry goes when the object does; objects that cannot be
+        weakly referenced (lists, dicts, ints) raise TypeError unless strong=True, which
+        keeps obj alive until its generation is evicted or it is unregistered.
+        """
+        with self._lock:
+            self._expire()
+            current = self._generations[-1]
+
+            token = self._by_id.get(id(obj))
+            entry = self._entries.get(token) if token is not None else None
+            if entry is not None and entry.resolve() is obj:
+                # Re-registration refreshes the entry into the current generation
+                entry.data = data
+                if strong == entry.weak:
+                    # The latest call decides how the object is held
+                    entry.target = obj if strong else _IdentityRef(obj, self._on_collected, token)
+                    entry.weak = not strong
+                if entry.generation != current.number:
+                    self._leave_generation(entry)
+                    entry.generation = current.number
+                    current.tokens.add(token)
+                current.updated = self.clock()
+                return token
+
+            if len(current.tokens) >= self.generation_size:
+                self._new_generation()
+                current = self._generations[-1]
+
+            token = next(self._tokens)
+            if strong:
+                target = obj
+            else:
+                try:
+                    target = _IdentityRef(obj, self._on_collected, token)
+                except TypeError:
+                    raise TypeError(f"cannot weakly reference a '{type(obj).__name__}'; "
+                                    f"register it with strong=True") from None
+            weak = not strong
+
+            self._entries[token] = _RegistryEntry(token, target, weak, data, current.number)
+            self._by_id[id(obj)] = token
+            current.tokens.add(token)
+            current.updated = self.clock()
+            return token
+
+    def lookup(self, obj, default=None):
+        """Data registered for this exact object, never for a reused id"""
+        with self._lock:
+            token = self._by_id.get(id(obj))
+            entry = self._entries.get(token) if token is not None else None
+            if entry is None or entry.resolve() is not obj:
+                return default
+            return entry.data
+
+    def get(self, token, default=None):
+        with self._lock:
+            entry = self._entries.get(token)
+            return default if entry is None else entry.data
+
+    def resolve(self, token, default=None):
+        """The registered object itself while it is alive and still registered"""
+        with self._lock:
+            entry = self._entries.get(token)
+            obj = entry.resolve() if entry is not None else None
+            return default if obj is None else obj
+
+    def unregister(self, obj):
+        with self._lock:
+            token = self._by_id.get(id(obj))
+            entry = self._entries.get(token) if token is not None else None
+            if entry is None or entry.resolve() is not obj:
+                return False
+            self._leave_generation(entry)
+            self._drop(token)
+            return True
+
+    def advance_generation(self):
+        """Start a new generation, evicting the oldest beyond max_generations"""
+        with self._lock:
+            self._new_generation()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def memory_usage(self, deep=False):
+        """Bytes held by the registry's containers, plus stored data when deep"""
+        with self._lock:
+            containers = (
+                sys.getsizeof(self._entries) + sys.getsizeof(self._by_id)
+                + sys.getsizeof(self._generations)
+                + sum(sys.getsizeof(generation.tokens) for generation in self._generations)
+            )
+            # A weakref callback may drop entries mid-sum through the re-entrant lock
+            snapshot = list(self._entries.values())
+            entries = sum(
+                sys.getsizeof(entry) + (sys.getsizeof(entry.target) if entry.weak else 0)
+                for entry in snapshot
+            )
+            report = {
+                'entries': len(self._entries),
+                'generations': len(self._generations),
+                'evicted': self.evicted,
+                'collected': self.collected,
+                'container_bytes': containers,
+                'entry_bytes': entries,
+            }
+            if deep:
+                report['data_bytes'] = sum(reachable_size(entry.data) for entry in snapshot)
+            return report
+
+
+class _IdentityRef(weakref.ref):
+    """Weak reference remembering its registry token and the referent's id"""
+
+    __slots__ = ('token', 'object_id')
+
+    def __new__(cls, obj, callback, token):
+        return super().__new__(cls, obj, callback)
+
+    def __init__(self, obj, callback, token):
+        super().__init__(obj, callback)
+        self.token = token
+        self.object_id = id(obj)
+
+# PROPER GLOBAL REGISTRY
+
+class ProperGlobalRegistry:
+
+    _registry = GenerationalRegistry(generation_size=10000, max_generations=8, max_age=3600)
+
+    @classmethod
+    def add_to_global_cache(cls, data, strong=False):
+        """Bounded replacement for MemoryLeakExamples.add_to_global_cache
+
+        data is stored once under a token, not 10000 times under a reusable id(). It is
+        held weakly and leaves with the caller's last reference; strong=True, required for
+        lists, dicts and other types without weak references, keeps it until its
+        generation is evicted (after max_age seconds or max_generations newer ones).
+        """
+        return cls._registry.register(data, strong=strong)
+
+    @classmethod
+    def get_from_global_cache(cls, token, default=None):
+        return cls._registry.resolve(token, default)
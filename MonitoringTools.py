@@ -0,0 +1,878 @@
+"""
+Python Monitoring Tools
+Long-running leak detection, profiling and GC pause helpers extending MemoryAndPerformance.MemoryMonitoring
+"""
+
+import contextlib
+import dis
+import gc
+import json
+import math
+import signal
+import sys
+import threading
+import time
+import tracemalloc
+import types
+import weakref
+from collections import Counter, deque
+
+# COMPLEXITY FITTING
+
+COMPLEXITY_MODELS = {
+    'O(1)': lambda n: 1.0,
+    'O(n)': lambda n: float(n),
+    'O(n log n)': lambda n: n * math.log(n) if n > 1 else 1.0,
+    'O(n^2)': lambda n: float(n) ** 2,
+    'O(n^3)': lambda n: float(n) ** 3,
+    'O(n^4)': lambda n: float(n) ** 4,
+}
+
+
+def fit_complexity(sizes, timings):
+    """Fit timings against each complexity model and pick the closest one"""
+    fits = {}
+    total = sum(t * t for t in timings) or 1.0
+
+    for name, model in COMPLEXITY_MODELS.items():
+        values = [model(n) for n in sizes]
+        scale = sum(t * v for t, v in zip(timings, values)) / sum(v * v for v in values)
+        residual = sum((t - scale * v) ** 2 for t, v in zip(timings, values))
+        fits[name] = residual / total
+
+    # Log-log slope gives a model-free exponent estimate
+    points = [(math.log(n), math.log(t)) for n, t in zip(sizes, timings) if n > 0 and t > 0]
+    exponent = None
+    if len(points) >= 2:
+        mean_x = sum(x for x, _ in points) / len(points)
+        mean_y = sum(y for _, y in points) / len(points)
+        spread = sum((x - mean_x) ** 2 for x, _ in points)
+        if spread:
+            exponent = sum((x - mean_x) * (y - mean_y) for x, y in points) / spread
+
+    return {
+        'best_fit': min(fits, key=fits.get),
+        'exponent': exponent,
+        'residuals': fits,
+    }
+
+# LEAK DETECTION
+
+class LeakSampler:
+    """Background sampler that diffs tracemalloc snapshots to find growing allocation sites"""
+
+    def __init__(self, interval=10.0, frame_depth=10, top=10, growth_windows=3,
+                 max_overhead=0.05, output=None, history=100):
+        self.interval = interval
+        self.frame_depth = frame_depth
+        self.top = top
+        self.growth_windows = growth_windows
+        self.max_overhead = max_overhead
+        self.output = output
+        self.records = deque(maxlen=history)
+
+        self._previous = None
+        self._previous_time = None
+        self._site_sizes = {}  # site -> recent sizes, only for sites that have grown
+        self._window = 0
+        self._started_tracing = False
+        self._records_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        if self._thread is not None:
+            raise RuntimeError("LeakSampler is already running")
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(self.frame_depth)
+            self._started_tracing = True
+
+        self._stop.clear()
+        self.sample()  # Baseline snapshot
+        self._thread = threading.Thread(target=self._run, name='LeakSampler', daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self, timeout=None):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            if self._thread.is_alive():
+                # Still mid-snapshot; tracing must outlive it, so stop() can simply be retried
+                raise RuntimeError("LeakSampler thread did not stop within the timeout")
+            self._thread = None
+        if self._started_tracing:
+            tracemalloc.stop()
+            self._started_tracing = False
+        self._previous = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            record = self.sample()
+            # Back off instead of letting sampling eat more than its share of the process
+            if record['overhead']['ratio'] > self.max_overhead:
+                self.interval *= 2
+
+    def _take_snapshot(self):
+        snapshot = tracemalloc.take_snapshot()
+        return snapshot.filter_traces((
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, __file__),
+        ))
+
+    def sample(self):
+        """Take one snapshot, diff it against the previous window and emit a record"""
+        started = time.perf_counter()
+        snapshot = self._take_snapshot()
+        previous, previous_time = self._previous, self._previous_time
+        self._previous, self._previous_time = snapshot, started
+
+        if previous is None:
+            return None
+
+        self._window += 1
+        growth = [stat for stat in snapshot.compare_to(previous, 'traceback') if stat.size_diff > 0]
+        top_growth = growth[:self.top]
+
+        current_sites = {}
+        for stat in top_growth:
+            site = tuple(f"{frame.filename}:{frame.lineno}" for frame in stat.traceback)
+            current_sites[site] = stat.size
+
+        # Sites that drop out of the top growth list stop being tracked
+        sizes = {}
+        for site, size in current_sites.items():
+            history = self._site_sizes.get(site, deque(maxlen=self.growth_windows + 1))
+            history.append(size)
+            sizes[site] = history
+        self._site_sizes = sizes
+
+        growing = [
+            {'site': list(site), 'sizes': list(history)}
+            for site, history in sizes.items()
+            if len(history) > self.growth_windows
+            and all(a < b for a, b in zip(history, list(history)[1:]))
+        ]
+
+        current, peak = tracemalloc.get_traced_memory()
+        elapsed = time.perf_counter() - started
+        window_seconds = started - previous_time
+
+        record = {
+            'timestamp': time.time(),
+            'window': self._window,
+            'traced_current': current,
+            'traced_peak': peak,
+            'top_growth': [
+                {
+                    'site': [f"{frame.filename}:{frame.lineno}" for frame in stat.traceback],
+                    'size': stat.size,
+                    'size_diff': stat.size_diff,
+                    'count_diff': stat.count_diff,
+                }
+                for stat in top_growth
+            ],
+            'growing_sites': growing,
+            'overhead': {
+                'sample_seconds': elapsed,
+                'ratio': elapsed / window_seconds if window_seconds > 0 else 0.0,
+                'tracemalloc_bytes': tracemalloc.get_tracemalloc_memory(),
+            },
+        }
+        self._emit(record)
+        return record
+
+    def _emit(self, record):
+        line = json.dumps(record) if self.output is not None else None
+        with self._records_lock:
+            self.records.append(record)
+            if line is None:
+                return
+            if callable(self.output):
+                self.output(line)
+            else:
+                self.output.write(line + '\n')
+                self.output.flush()
+
+    def recent(self):
+        """Copy of the retained records, safe to read while the sampler is running"""
+        with self._records_lock:
+            return list(self.records)
+
+# SAMPLING PROFILER
+
+class SamplingProfiler:
+    """Statistical profiler that samples every thread's stack from a timer signal or a thread
+
+    The signal backend runs in the main thread between bytecodes and still sees every thread
+    through sys._current_frames(), without the GIL handoff a sampler thread pays per sample.
+    The thread backend covers profilers started off the main thread or without setitimer.
+    """
+
+    BACKENDS = ('signal', 'thread')
+
+    def __init__(self, rate=1000, max_depth=128, all_threads=True, backend=None):
+        if backend is not None and backend not in self.BACKENDS:
+            raise ValueError(f"Unknown profiler backend: {backend}")
+        self.rate = rate
+        self.max_depth = max_depth
+        self.all_threads = all_threads
+        self.backend = backend
+        self.sample_count = 0
+
+        self._samples = Counter()  # (thread ident, leaf-first code objects) -> count
+        self._labels = {}
+        self._thread_names = {}
+        self._busy = 0.0
+        self._started = None
+        self._elapsed = 0.0
+        self._target = None
+        self._running = False
+        self._previous_handler = None
+        self._stop = threading.Event()
+        self._thread = None
+
+    @staticmethod
+    def _signal_available():
+        return (hasattr(signal, 'setitimer')
+                and threading.current_thread() is threading.main_thread()
+                and signal.getitimer(signal.ITIMER_REAL)[0] == 0
+                and signal.getsignal(signal.SIGALRM) in (signal.SIG_DFL, None))
+
+    def start(self):
+        if self._running:
+            raise RuntimeError("SamplingProfiler is already running")
+        backend = self.backend or ('signal' if self._signal_available() else 'thread')
+        if backend == 'signal' and not self._signal_available():
+            raise RuntimeError("The signal backend needs the main thread and a free ITIMER_REAL")
+
+        self.backend = backend
+        self._target = threading.get_ident()
+        self._running = True
+        self._started = time.perf_counter()
+        interval = 1.0 / self.rate
+        if backend == 'signal':
+            self._calibrate_dispatch()
+            self._previous_handler = signal.signal(signal.SIGALRM, self._handle_signal)
+            signal.setitimer(signal.ITIMER_REAL, interval, interval)
+        else:
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name='SamplingProfiler', daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        if not self._running:
+            return
+        if self.backend == 'signal':
+            signal.setitimer(signal.ITIMER_REAL, 0)
+            signal.signal(signal.SIGALRM, self._previous_handler)
+        else:
+            self._stop.set()
+            self._thread.join()
+            self._thread = None
+        self._running = False
+        self._elapsed += time.perf_counter() - self._started
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    _dispatch_seconds = None
+
+    @classmethod
+    def _calibrate_dispatch(cls, rounds=200):
+        """Wall time to deliver one signal to a Python handler, which the handler cannot time itself"""
+        if cls._dispatch_seconds is not None:
+            return
+        previous = signal.signal(signal.SIGALRM, lambda signum, frame: None)
+        try:
+            started = time.perf_counter()
+            for _ in range(rounds):
+                signal.raise_signal(signal.SIGALRM)
+            cls._dispatch_seconds = (time.perf_counter() - started) / rounds
+        finally:
+            signal.signal(signal.SIGALRM, previous)
+
+    def _handle_signal(self, signum, frame):
+        started = time.perf_counter()
+        # frame is where the main thread was interrupted, below this handler
+        self._sample(None, frame)
+        self._busy += time.perf_counter() - started
+
+    def _run(self):
+        interval = 1.0 / self.rate
+        own = threading.get_ident()
+        next_tick = time.perf_counter()
+
+        while not self._stop.is_set():
+            started = time.perf_counter()
+            self._sample(own)
+            self._busy += time.perf_counter() - started
+
+            next_tick += interval
+            delay = next_tick - time.perf_counter()
+            if delay > 0:
+                self._stop.wait(delay)
+            else:
+                next_tick = time.perf_counter()  # Fell behind; skip ticks rather than burst
+
+    def _sample(self, own, main_frame=None):
+        frames = sys._current_frames()
+        if main_frame is not None:
+            frames[self._target] = main_frame
+
+        own_codes = self._OWN_CODES
+        for ident, frame in frames.items():
+            if ident == own or (not self.all_threads and ident != self._target):
+                continue
+
+            codes = []
+            while frame is not None and len(codes) < self.max_depth:
+                code = frame.f_code
+                if code in own_codes:
+                    break  # Starting or stopping the profiler; not the program's time
+                codes.append(code)
+                frame = frame.f_back
+            else:
+                if ident not in self._thread_names:
+                    self._thread_name(ident)  # Name it now; the thread may be gone by report time
+                self._samples[ident, tuple(codes)] += 1
+        self.sample_count += 1
+
+    def _label(self, code):
+        label = self._labels.get(code)
+        if label is None:
+            name = getattr(code, 'co_qualname', code.co_name)
+            # Semicolons separate frames in the collapsed format
+            label = f"{name} ({code.co_filename}:{code.co_firstlineno})".replace(';', ':')
+            self._labels[code] = label
+        return label
+
+    def _thread_name(self, ident):
+        name = self._thread_names.get(ident)
+        if name is None:
+            self._thread_names.update((thread.ident, thread.name) for thread in threading.enumerate())
+            name = self._thread_names.get(ident, f"thread-{ident}")
+        return name
+
+    @property
+    def stacks(self):
+        """Counter of "thread;outer frame;...;leaf frame" stacks, labelled on demand"""
+        stacks = Counter()
+        for (ident, codes), count in list(self._samples.items()):
+            labels = [self._label(code) for code in reversed(codes)]
+            stacks[';'.join([self._thread_name(ident)] + labels)] += count
+        return stacks
+
+    def collapsed(self):
+        """Collapsed stacks, one "frame;frame;frame count" line each, for flamegraph tools"""
+        return '\n'.join(f"{stack} {count}" for stack, count in self.stacks.most_common())
+
+    def overhead(self):
+        """Estimated fraction of wall time taken from the program: signal delivery plus handler
+        time, or the sampler thread's GIL hold time (its GIL handoffs are not included)"""
+        elapsed = self._elapsed
+        if self._running:
+            elapsed += time.perf_counter() - self._started
+        busy = self._busy
+        if self.backend == 'signal':
+            busy += self.sample_count * self._dispatch_seconds
+        return busy / elapsed if elapsed else 0.0
+
+    @classmethod
+    def measure_wall_overhead(cls, func, *args, repeat=5, **kwargs):
+        """Median slowdown of func under the profiler, from paired runs with and without it"""
+        ratios = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            func(*args, **kwargs)
+            plain = time.perf_counter() - started
+
+            with cls():
+                started = time.perf_counter()
+                func(*args, **kwargs)
+                profiled = time.perf_counter() - started
+            ratios.append(profiled / plain if plain else 1.0)
+
+        ratios.sort()
+        return ratios[len(ratios) // 2] - 1.0
+
+
+SamplingProfiler._OWN_CODES = frozenset(
+    method.__code__ for method in (
+        SamplingProfiler.start, SamplingProfiler.stop, SamplingProfiler.__enter__,
+        SamplingProfiler.__exit__, SamplingProfiler._handle_signal, SamplingProfiler._run,
+    )
+)
+
+# CLOSURE ANALYSIS
+
+_DEREF_OPS = {'LOAD_DEREF', 'STORE_DEREF', 'DELETE_DEREF', 'LOAD_CLOSURE', 'LOAD_CLASSDEREF'}
+
+
+def reachable_size(obj, limit=1000000):
+    """Bytes reachable from obj through gc referents, excluding classes, modules and globals"""
+    seen = set()
+    stack = [obj]
+    total = 0
+
+    while stack and len(seen) < limit:
+        current = stack.pop()
+        if id(current) in seen or isinstance(current, (type, types.ModuleType)):
+            continue
+        seen.add(id(current))
+        total += sys.getsizeof(current)
+
+        referents = gc.get_referents(current)
+        if isinstance(current, types.FunctionType):
+            referents = [r for r in referents if r is not current.__globals__]
+        stack.extend(referents)
+
+    return total
+
+
+def referenced_free_vars(code):
+    """Free variable names the code object's bytecode actually touches"""
+    freevars = set(code.co_freevars)
+    names = set()
+    for instruction in dis.get_instructions(code):
+        # Newer interpreters load cells for nested closures with LOAD_FAST variants
+        if instruction.opname in _DEREF_OPS or instruction.opname.startswith('LOAD_FAST'):
+            argval = instruction.argval
+            names.update(argval if isinstance(argval, tuple) else (argval,))
+    return names & freevars
+
+
+def analyze_closure(func):
+    """Report each closure cell and default argument with its reachable size"""
+    code = func.__code__
+    referenced = referenced_free_vars(code)
+    captures = []
+
+    for name, cell in zip(code.co_freevars, func.__closure__ or ()):
+        try:
+            value = cell.cell_contents
+        except ValueError:
+            continue  # Empty cell
+        captures.append({
+            'name': name,
+            'kind': 'closure',
+            'type': type(value).__name__,
+            'shallow_bytes': sys.getsizeof(value),
+            'reachable_bytes': reachable_size(value),
+            'referenced': name in referenced,
+        })
+
+    positional = code.co_varnames[:code.co_argcount]
+    defaults = dict(zip(positional[len(positional) - len(func.__defaults__ or ()):],
+                        func.__defaults__ or ()))
+    defaults.update(func.__kwdefaults__ or {})
+    for name, value in defaults.items():
+        captures.append({
+            'name': name,
+            'kind': 'default',
+            'type': type(value).__name__,
+            'shallow_bytes': sys.getsizeof(value),
+            'reachable_bytes': reachable_size(value),
+            'referenced': True,
+        })
+
+    captures.sort(key=lambda capture: capture['reachable_bytes'], reverse=True)
+    return {
+        'function': f"{func.__module__}.{func.__qualname__}",
+        'captures': captures,
+        'total_bytes': sum(capture['reachable_bytes'] for capture in captures),
+        'unreferenced_bytes': sum(
+            capture['reachable_bytes'] for capture in captures if not capture['referenced']
+        ),
+    }
+
+
+def slim_closure(func, drop=()):
+    """Rebuild func with empty cells for captures its code never uses (plus any in drop)"""
+    code = func.__code__
+    keep = referenced_free_vars(code) - set(drop)
+    cells = tuple(
+        cell if name in keep else types.CellType()
+        for name, cell in zip(code.co_freevars, func.__closure__ or ())
+    )
+
+    slim = types.FunctionType(code, func.__globals__, func.__name__, func.__defaults__,
+                              cells or None)
+    slim.__kwdefaults__ = func.__kwdefaults__
+    slim.__qualname__ = func.__qualname__
+    slim.__doc__ = func.__doc__
+    slim.__module__ = func.__module__
+    slim.__annotations__ = dict(func.__annotations__)
+    # Not functools.update_wrapper: __wrapped__ would keep the original closure alive
+    slim.__dict__.update(func.__dict__)
+    return slim
+
+
+def find_heavy_closures(functions, min_bytes=1 << 20):
+    """Analyze many callbacks and return those pinning at least min_bytes, largest first"""
+    reports = [analyze_closure(func) for func in functions]
+    heavy = [report for report in reports if report['total_bytes'] >= min_bytes]
+    heavy.sort(key=lambda report: report['total_bytes'], reverse=True)
+    return heavy
+
+# GC INSTRUMENTATION
+
+class PauseHistogram:
+    """Log-scaled pause histogram; bucket i counts pauses shorter than 2**i microseconds"""
+
+    def __init__(self, buckets=24):
+        self.counts = [0] * (buckets + 1)  # The last bucket takes everything longer
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def record(self, seconds):
+        index = min(int(seconds * 1e6).bit_length(), len(self.counts) - 1)
+        self.counts[index] += 1
+        self.count += 1
+        self.total += seconds
+        if seconds > self.max:
+            self.max = seconds
+
+    def percentile(self, fraction):
+        """Upper bound of the bucket holding the given fraction of pauses, capped at the max"""
+        if not self.count:
+            return 0.0
+        wanted = fraction * self.count
+        seen = 0
+        for index, count in enumerate(self.counts):
+            seen += count
+            if seen >= wanted:
+                return min((1 << index) / 1e6, self.max)
+        return self.max
+
+    def snapshot(self):
+        last = len(self.counts) - 1
+        return {
+            'count': self.count,
+            'total_seconds': self.total,
+            'max_seconds': self.max,
+            'p50_seconds': self.percentile(0.50),
+            'p99_seconds': self.percentile(0.99),
+            'buckets': {
+                (f"<{1 << index}us" if index < last else f">={1 << (last - 1)}us"): count
+                for index, count in enumerate(self.counts) if count
+            },
+        }
+
+
+class GCMonitor:
+    """Times every collection through gc.callbacks and keeps per-generation pause histograms"""
+
+    def __init__(self, history=1000):
+        generations = len(gc.get_threshold())
+        self.histograms = [PauseHistogram() for _ in range(generations)]
+        self.collections = [0] * generations
+        self.collected = [0] * generations
+        self.uncollectable = [0] * generations
+        self.pauses = deque(maxlen=history)  # (timestamp, generation, seconds, collected, uncollectable)
+        self._collection_started = None
+        self._running = False
+
+    def start(self):
+        if self._running:
+            raise RuntimeError("GCMonitor is already running")
+        self._collection_started = None
+        gc.callbacks.append(self._callback)
+        self._running = True
+        return self
+
+    def stop(self):
+        if self._running:
+            gc.callbacks.remove(self._callback)
+            self._running = False
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    def _callback(self, phase, info):
+        # Runs inside the collector: record and return, never allocate much here
+        if phase == 'start':
+            self._collection_started = time.perf_counter()
+            return
+        started, self._collection_started = self._collection_started, None
+        if started is None:
+            return  # Installed while a collection was already running
+
+        seconds = time.perf_counter() - started
+        generation = info['generation']
+        self.histograms[generation].record(seconds)
+        self.collections[generation] += 1
+        self.collected[generation] += info['collected']
+        self.uncollectable[generation] += info['uncollectable']
+        self.pauses.append((started, generation, seconds, info['collected'], info['uncollectable']))
+
+    def report(self):
+        return {
+            'generations': [
+                {
+                    'generation': generation,
+                    'collections': self.collections[generation],
+                    'collected': self.collected[generation],
+                    'uncollectable': self.uncollectable[generation],
+                    'pauses': histogram.snapshot(),
+                }
+                for generation, histogram in enumerate(self.histograms)
+            ],
+            'total_pause_seconds': sum(histogram.total for histogram in self.histograms),
+            'max_pause_seconds': max(histogram.max for histogram in self.histograms),
+            'garbage': len(gc.garbage),
+        }
+
+# GC POLICIES
+
+class GCPolicy:
+    """Leaves the collector alone; the baseline every other policy is compared against"""
+
+    name = 'default'
+
+    def apply(self):
+        pass
+
+    def restore(self):
+        pass
+
+    def busy(self):
+        """Mark a unit of latency-sensitive work; only idle-window policies care"""
+        return contextlib.nullcontext()
+
+    def __enter__(self):
+        self.apply()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.restore()
+
+
+class ThresholdPolicy(GCPolicy):
+    """Raise the collection thresholds so young collections run less often"""
+
+    name = 'threshold'
+
+    def __init__(self, threshold0=10000, threshold1=50, threshold2=100):
+        self.thresholds = (threshold0, threshold1, threshold2)
+        self._previous = None
+
+    def apply(self):
+        self._previous = gc.get_threshold()
+        gc.set_threshold(*self.thresholds)
+
+    def restore(self):
+        if self._previous is not None:
+            gc.set_threshold(*self._previous)
+            self._previous = None
+
+
+class FreezePolicy(GCPolicy):
+    """Collect once after warm-up, then move every survivor out of the collector's reach"""
+
+    name = 'freeze'
+
+    def __init__(self, warm_up=None):
+        self.warm_up = warm_up
+        self.frozen = 0
+
+    def apply(self):
+        if self.warm_up is not None:
+            self.warm_up()
+        # Collect first so warm-up garbage is not frozen along with the long-lived heap
+        gc.collect()
+        gc.freeze()
+        self.frozen = gc.get_freeze_count()
+
+    def restore(self):
+        gc.unfreeze()
+
+
+class IdleCollectionPolicy(GCPolicy):
+    """Defer older-generation collections to idle windows between busy() sections
+
+    Young collections stay automatic since their pauses are short. Idle windows collect
+    the middle generation, plus a full collection every full_interval seconds; after
+    max_delay seconds without an idle window the collection is forced anyway. The
+    collector thread sleeps until a busy() section ends or max_delay passes.
+    """
+
+    name = 'idle'
+
+    _DEFERRED = 1 << 30
+
+    def __init__(self, idle_after=0.002, max_delay=1.0, full_interval=60.0):
+        self.idle_after = idle_after
+        self.max_delay = max_delay
+        self.full_interval = full_interval
+        self.idle_collections = 0
+        self.forced_collections = 0
+        self.wakeups = 0
+
+        self._active = 0
+        self._last_active = time.perf_counter()
+        self._last_collection = self._last_active
+        self._last_full = self._last_active
+        self._lock = threading.Lock()
+        self._previous = None
+        self._stop = threading.Event()
+        self._wake = threading.Event()
+        self._waiting = False  # The collector is blocked until the next busy() exit
+        self._thread = None
+
+    def apply(self):
+        if self._thread is not None:
+            raise RuntimeError("IdleCollectionPolicy is already applied")
+        self._previous = gc.get_threshold()
+        gc.set_threshold(self._previous[0], self._DEFERRED, self._DEFERRED)
+        self._last_collection = self._last_full = time.perf_counter()
+        self._stop.clear()
+        self._wake.clear()
+        self._waiting = True
+        self._thread = threading.Thread(target=self._run, name='IdleCollector', daemon=True)
+        self._thread.start()
+
+    def restore(self):
+        self._stop.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        if self._previous is not None:
+            gc.set_threshold(*self._previous)
+            self._previous = None
+
+    @contextlib.contextmanager
+    def busy(self):
+        with self._lock:
+            self._active += 1
+        try:
+            yield
+        finally:
+            with self._lock:
+                self._active -= 1
+                self._last_active = time.perf_counter()
+                wake = self._waiting and not self._active
+            if wake:
+                self._wake.set()
+
+    def _collect(self, full):
+        gc.collect(2 if full else 1)
+        self._last_collection = time.perf_counter()
+        if full:
+            self._last_full = self._last_collection
+
+    def _until_due(self, now):
+        """Seconds until the next full or forced collection could fall due, at most max_delay"""
+        due = min(self._last_full + self.full_interval, self._last_collection + self.max_delay)
+        return due - now if due > now else self.max_delay
+
+    def _run(self):
+        timeout = self.max_delay
+        while True:
+            self._wake.wait(timeout)
+            if self._stop.is_set():
+                return
+            self.wakeups += 1
+            with self._lock:
+                self._wake.clear()
+                self._waiting = False
+                active, last_active = self._active, self._last_active
+
+            now = time.perf_counter()
+            idle_for = now - last_active
+            if not active and idle_for < self.idle_after:
+                # A section just ended; look again once the idle window would open
+                timeout = self.idle_after - idle_for
+                continue
+
+            full_due = now - self._last_full >= self.full_interval
+            # Young collections have promoted survivors the middle generation now holds
+            if full_due or gc.get_count()[1] > 0:
+                if not active:
+                    self.idle_collections += 1
+                    self._collect(full_due)
+                elif now - self._last_collection >= self.max_delay:
+                    self.forced_collections += 1
+                    self._collect(full_due)
+
+            with self._lock:
+                if not self._active and self._last_active != last_active:
+                    timeout = 0  # A section ended while this one was being handled
+                else:
+                    self._waiting = True
+                    timeout = self._until_due(time.perf_counter())
+
+
+def benchmark_gc_policies(requests=2000, cycles_per_request=20, long_lived=300000,
+                          idle_every=50, idle_seconds=0.01):
+    """Request latency and GC pauses per policy while handlers churn reference cycles"""
+    from MemoryAndPerformance import MemoryLeakExamples, ProperResourceManagement
+
+    leaks = MemoryLeakExamples()
+    proper = ProperResourceManagement()
+
+    report = {'requests': requests, 'long_lived_objects': long_lived, 'policies': []}
+    for policy in (GCPolicy(), ThresholdPolicy(), FreezePolicy(), IdleCollectionPolicy()):
+        gc.collect()
+        # A long-lived heap like a warmed-up service's is what makes full collections expensive
+        heap = [{'id': i, 'tags': [i]} for i in range(long_lived)]
+        probes = []  # One weak reference per request to a cycle's root node
+        latencies = []
+        started = time.perf_counter()
+
+        with policy, GCMonitor() as monitor:
+            for request in range(requests):
+                request_started = time.perf_counter()
+                with policy.busy():
+                    probes.append(weakref.ref(leaks.create_circular_references()))
+                    for _ in range(cycles_per_request - 1):
+                        leaks.create_circular_references()
+                    for _ in range(cycles_per_request):
+                        proper.create_circular_references()
+                latencies.append(time.perf_counter() - request_started)
+                if idle_every and (request + 1) % idle_every == 0:
+                    time.sleep(idle_seconds)
+
+        elapsed = time.perf_counter() - started
+        alive_after_run = sum(probe() is not None for probe in probes)
+        leftover = gc.collect()
+        alive_after_collect = sum(probe() is not None for probe in probes)
+        del heap
+
+        latencies.sort()
+        result = {
+            'policy': policy.name,
+            'seconds': elapsed,
+            'latency_p50_seconds': latencies[len(latencies) // 2],
+            'latency_p99_seconds': latencies[int(len(latencies) * 0.99)],
+            'latency_max_seconds': latencies[-1],
+            'gc': monitor.report(),
+            'reclaimed': sum(monitor.collected) + leftover,
+            'leftover_collected': leftover,
+            'cycles_alive_after_run': alive_after_run,
+            'all_reclaimed': alive_after_collect == 0 and not any(monitor.uncollectable),
+        }
+        if isinstance(policy, FreezePolicy):
+            result['frozen_objects'] = policy.frozen
+        if isinstance(policy, IdleCollectionPolicy):
+            result['idle_collections'] = policy.idle_collections
+            result['forced_collections'] = policy.forced_collections
+            result['collector_wakeups'] = policy.wakeups
+        report['policies'].append(result)
+
+    return report
@@ -0,0 +1,229 @@
+"""
+Python Performance Benchmark Harness
+Runs each PerformanceAntiPatterns method against its fixed counterpart across
+input sizes and reports wall time, allocations, peak memory and fitted complexity
+"""
+
+import argparse
+import inspect
+import json
+import platform
+import sys
+import time
+
+from MemoryAndPerformance import (
+    MemoryMonitoring,
+    PerformanceAntiPatterns,
+    ProperResourceManagement,
+)
+from AntiPatternDetector import benchmark_anti_pattern_detector
+from BatchExecutor import benchmark_batch_executor
+from CorpusRunner import benchmark_corpus_runner
+from EventBus import benchmark_event_bus
+from MonitoringTools import benchmark_gc_policies, fit_complexity
+from PerformanceEngines import EfficientPerformancePatterns
+from ResourcePools import (
+    benchmark_bulk_writer,
+    benchmark_connection_pool,
+    benchmark_socket_pool,
+)
+from StreamingPipelines import benchmark_async_streaming, benchmark_streaming, benchmark_text_emitter
+from SyntaxChecker import benchmark_syntax_checker
+
+# COMPLEXITY MODELS
+
+# Log-log slope each model should produce; n log n reads a little above 1 at these sizes
+COMPLEXITY_EXPONENTS = {
+    'O(1)': 0.0,
+    'O(n)': 1.0,
+    'O(n log n)': 1.1,
+    'O(n^2)': 2.0,
+    'O(n^3)': 3.0,
+    'O(n^4)': 4.0,
+}
+
+# Adjacent classes are indistinguishable over one octave of sizes, so only a clearly
+# steeper slope counts as a regression
+REGRESSION_TOLERANCE = 0.5
+
+# BENCHMARK PAIRS
+
+class BenchmarkPair:
+    """An anti-pattern method paired with its fixed counterpart"""
+
+    def __init__(self, anti_pattern, fixed, sizes, make_args=None, expected='O(n)'):
+        self.anti_pattern = anti_pattern
+        self.fixed = fixed
+        self.sizes = list(sizes)
+        self.make_args = make_args or (lambda n: ((), {'n': n}))
+        self.expected = expected
+
+    @property
+    def fixed_name(self):
+        return getattr(self.fixed, '__qualname__', repr(self.fixed))
+
+
+# Fixed counterparts keyed by the PerformanceAntiPatterns method they replace
+PAIRS = {
+    'string_concatenation_in_loop': BenchmarkPair(
+        'string_concatenation_in_loop',
+        ProperResourceManagement().proper_string_building,
+        sizes=[10000, 20000, 40000, 80000],
+    ),
+    'nested_loop_inefficiency': BenchmarkPair(
+        'nested_loop_inefficiency',
+        EfficientPerformancePatterns().hash_join_equal_values,
+        sizes=[10, 15, 20, 30],
+        expected='O(n^2)',
+    ),
+    'repeated_expensive_operations': BenchmarkPair(
+        'repeated_expensive_operations',
+        EfficientPerformancePatterns().batched_expensive_operations,
+        sizes=[100, 200, 400, 800],
+        # Repeated items exercise the digit-sort cache
+        make_args=lambda n: (([i % 100 for i in range(n)],), {}),
+    ),
+    'inefficient_membership_testing': BenchmarkPair(
+        'inefficient_membership_testing',
+        EfficientPerformancePatterns().indexed_membership_testing,
+        sizes=[1000, 2000, 4000, 8000],
+    ),
+    'list_concatenation_in_loop': BenchmarkPair(
+        'list_concatenation_in_loop',
+        EfficientPerformancePatterns().buffered_list_building,
+        sizes=[2000, 4000, 8000, 16000],
+    ),
+}
+
+
+def discover_pairs():
+    """Match every public PerformanceAntiPatterns method to its fixed counterpart"""
+    paired = []
+    unpaired = []
+
+    for name, _ in inspect.getmembers(PerformanceAntiPatterns, inspect.isfunction):
+        if name.startswith('_'):
+            continue
+        if name in PAIRS:
+            paired.append(PAIRS[name])
+        else:
+            unpaired.append(name)
+
+    return paired, unpaired
+
+# BENCHMARK HARNESS
+
+class BenchmarkHarness:
+
+    def __init__(self, repeat=3):
+        self.repeat = repeat
+        self.monitor = MemoryMonitoring()
+
+    def measure(self, func, n, make_args):
+        """Best-of-repeat wall time plus one traced run for memory"""
+        args, kwargs = make_args(n)
+        timings = []
+
+        for _ in range(self.repeat):
+            start = time.perf_counter()
+            func(*args, **kwargs)
+            timings.append(time.perf_counter() - start)
+
+        # Tracing slows the call down, so memory is measured on a separate run
+        args, kwargs = make_args(n)
+        usage = self.monitor.measure_memory_usage(func, *args, **kwargs)
+
+        return {
+            'n': n,
+            'wall_time': min(timings),
+            'live_blocks': usage['live_blocks'],
+            'current_memory': usage['current_memory'],
+            'peak_memory': usage['peak_memory'],
+        }
+
+    def run_pair(self, pair):
+        """Sweep both variants of a pair over its sizes"""
+        anti_pattern = getattr(PerformanceAntiPatterns(), pair.anti_pattern)
+        results = {}
+
+        for label, func in (('anti_pattern', anti_pattern), ('fixed', pair.fixed)):
+            samples = [self.measure(func, n, pair.make_args) for n in pair.sizes]
+            results[label] = {
+                'samples': samples,
+                'fit': fit_complexity(pair.sizes, [s['wall_time'] for s in samples]),
+            }
+
+        exponent = results['fixed']['fit']['exponent']
+        regressed = (exponent is not None
+                     and exponent > COMPLEXITY_EXPONENTS[pair.expected] + REGRESSION_TOLERANCE)
+
+        return {
+            'anti_pattern': pair.anti_pattern,
+            'fixed': pair.fixed_name,
+            'expected': pair.expected,
+            'sizes': pair.sizes,
+            'results': results,
+            'regressed': regressed,
+        }
+
+    def run(self, names=None):
+        """Run every discovered pair and build a machine-readable report"""
+        paired, unpaired = discover_pairs()
+        if names:
+            paired = [pair for pair in paired if pair.anti_pattern in names]
+
+        return {
+            'python': sys.version.split()[0],
+            'platform': platform.platform(),
+            'repeat': self.repeat,
+            'pairs': [self.run_pair(pair) for pair in paired],
+            'unpaired': unpaired,
+        }
+
+
+# SUBSYSTEM BENCHMARKS
+
+# Benchmarks for subsystems that have no single anti-pattern method to pair with
+SUBSYSTEM_BENCHMARKS = {
+    'connection_pool': benchmark_connection_pool,
+    'socket_pool': benchmark_socket_pool,
+    'bulk_writer': benchmark_bulk_writer,
+    'event_bus': benchmark_event_bus,
+    'gc_policies': benchmark_gc_policies,
+    'streaming': benchmark_streaming,
+    'async_streaming': benchmark_async_streaming,
+    'text_emitter': benchmark_text_emitter,
+    'syntax_checker': benchmark_syntax_checker,
+    'corpus_runner': benchmark_corpus_runner,
+    'anti_pattern_detector': benchmark_anti_pattern_detector,
+    'batch_executor': benchmark_batch_executor,
+}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('names', nargs='*', help='anti-pattern methods to benchmark (default: all)')
+    parser.add_argument('--repeat', type=int, default=3, help='timed runs per size')
+    parser.add_argument('--output', help='write the JSON report to this file')
+    parser.add_argument('--subsystem', action='append', choices=sorted(SUBSYSTEM_BENCHMARKS),
+                        help='run a subsystem benchmark instead of the pairs (repeatable)')
+    args = parser.parse_args(argv)
+
+    if args.subsystem:
+        report = {name: SUBSYSTEM_BENCHMARKS[name]() for name in args.subsystem}
+    else:
+        report = BenchmarkHarness(repeat=args.repeat).run(args.names)
+    text = json.dumps(report, indent=2)
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(text)
+    else:
+        print(text)
+
+    # Non-zero exit lets CI catch a fixed variant that regressed
+    return 1 if any(pair['regressed'] for pair in report.get('pairs', ())) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,409 @@
+"""
+Python Performance Engines
+Efficient counterparts for the anti-patterns in MemoryAndPerformance.PerformanceAntiPatterns
+"""
+
+import sys
+from array import array
+from bisect import bisect_left
+from collections import Counter
+from functools import lru_cache
+from itertools import islice
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional; every engine has a pure Python path
+    np = None
+
+INT64_MAX = 2 ** 63 - 1
+
+_EMPTY_ARRAY_SIZE = sys.getsizeof(array('q'))
+
+# Loop invariant recomputed per item by repeated_expensive_operations
+EXPENSIVE_FACTOR = sum(range(10000))
+
+# GROWABLE INT BUFFER
+
+class IntBuffer:
+    """Growable int64 buffer with amortized O(1) append, the standard numeric sequence builder"""
+
+    BACKENDS = ('array', 'numpy')
+
+    def __init__(self, values=(), backend='array', capacity=16):
+        if backend not in self.BACKENDS:
+            raise ValueError(f"Unknown buffer backend: {backend}")
+        if backend == 'numpy' and np is None:
+            raise ImportError("The numpy buffer backend requires NumPy")
+
+        self.backend = backend
+        if backend == 'array':
+            # array('q') already over-allocates geometrically in C
+            self._data = array('q')
+            self.append = self._data.append
+        else:
+            self._data = np.empty(max(capacity, 1), dtype=np.int64)
+            self._size = 0
+        self.extend(values)
+
+    def _grow(self, needed):
+        """Double the NumPy storage until it holds at least `needed` items"""
+        capacity = len(self._data)
+        while capacity < needed:
+            capacity *= 2
+        grown = np.empty(capacity, dtype=np.int64)
+        grown[:self._size] = self._data[:self._size]
+        self._data = grown
+
+    def append(self, value):
+        if self._size == len(self._data):
+            self._grow(self._size + 1)
+        self._data[self._size] = value
+        self._size += 1
+
+    def extend(self, values):
+        if self.backend == 'array':
+            self._data.extend(values if isinstance(values, array) else array('q', values))
+            return
+
+        if not hasattr(values, '__len__'):
+            values = np.fromiter(values, dtype=np.int64)
+        count = len(values)
+        if self._size + count > len(self._data):
+            self._grow(self._size + count)
+        self._data[self._size:self._size + count] = values
+        self._size += count
+
+    def _view(self):
+        return self._data if self.backend == 'array' else self._data[:self._size]
+
+    def __len__(self):
+        return len(self._data) if self.backend == 'array' else self._size
+
+    def __getitem__(self, index):
+        item = self._view()[index]
+        return item if self.backend == 'array' else item.tolist()
+
+    def __iter__(self):
+        return iter(self._view() if self.backend == 'array' else self._view().tolist())
+
+    def memoryview(self):
+        """Zero-copy view; an array-backed buffer cannot grow while a view is held"""
+        return memoryview(self._view())
+
+    def to_list(self):
+        return self._view().tolist()
+
+    @property
+    def nbytes(self):
+        return len(self) * 8
+
+    @property
+    def capacity(self):
+        """Items the storage holds before it next reallocates"""
+        if self.backend == 'numpy':
+            return len(self._data)
+        # buffer_info() only gives the length; array's __sizeof__ counts every allocated slot
+        return (sys.getsizeof(self._data) - _EMPTY_ARRAY_SIZE) // self._data.itemsize
+
+# EQUAL-VALUE JOIN
+
+class EqualValueJoin:
+    """Hash-indexed replacement for the O(n^4) scan in nested_loop_inefficiency"""
+
+    def __init__(self, matrix, use_numpy=None):
+        self.rows = len(matrix)
+        self.cols = len(matrix[0]) if self.rows else 0
+        self.use_numpy = np is not None and use_numpy is not False
+        self._matrix = matrix
+        self._index = None
+
+    @classmethod
+    def from_size(cls, n, use_numpy=None):
+        """Build the same matrix[i][j] = i + j input nested_loop_inefficiency uses"""
+        if use_numpy is not False and np is not None:
+            grid = np.arange(n)
+            return cls(grid[:, None] + grid[None, :], use_numpy=use_numpy)
+        return cls([IntBuffer(range(i, i + n)) for i in range(n)], use_numpy=use_numpy)
+
+    def count(self):
+        """Count-only fast path: sum of squared group sizes, no tuples or index built"""
+        if self._index is not None:
+            return sum(len(positions) ** 2 for positions in self._index.values())
+
+        if self.use_numpy:
+            _, counts = np.unique(np.asarray(self._matrix), return_counts=True)
+            counts = counts.astype(np.int64)
+            return int((counts * counts).sum())
+
+        counts = Counter()
+        for row in self._matrix:
+            counts.update(row)
+        return sum(c * c for c in counts.values())
+
+    def build_index(self):
+        """Group flat row-major positions by value"""
+        if self._index is not None:
+            return self._index
+
+        if self.use_numpy:
+            values, inverse = np.unique(np.asarray(self._matrix).ravel(), return_inverse=True)
+            order = np.argsort(inverse, kind='stable')
+            bounds = np.searchsorted(inverse[order], np.arange(len(values) + 1))
+            self._index = {
+                values[g].item(): order[bounds[g]:bounds[g + 1]]
+                for g in range(len(values))
+            }
+        else:
+            index = {}
+            position = 0
+            for row in self._matrix:
+                for value in row:
+                    positions = index.get(value)
+                    if positions is None:
+                        positions = index[value] = IntBuffer()
+                    positions.append(position)
+                    position += 1
+            self._index = index
+
+        return self._index
+
+    def pairs(self):
+        """Lazily yield (i, j, k, l) in the same order as the nested loops"""
+        index = self.build_index()
+        cols = self.cols
+
+        for i, row in enumerate(self._matrix):
+            for j, value in enumerate(row):
+                key = value.item() if hasattr(value, 'item') else value
+                for position in index[key]:
+                    k, l = divmod(int(position), cols)
+                    yield (i, j, k, l)
+
+    def __len__(self):
+        return self.count()
+
+# EXPENSIVE OPERATIONS PIPELINE
+
+class ExpensiveOperationsPipeline:
+    """Batch version of repeated_expensive_operations with hoisted invariants"""
+
+    def __init__(self, factor=EXPENSIVE_FACTOR, cache_size=65536, chunk_size=65536, use_numpy=None):
+        self.factor = factor
+        self.chunk_size = chunk_size
+        self.use_numpy = np is not None and use_numpy is not False
+        # Keyed on the text: equal values such as 0.0 and -0.0 can still print differently
+        self.sort_digits = lru_cache(maxsize=cache_size)(self._sort_digits)
+
+    @staticmethod
+    def _sort_digits(text):
+        return ''.join(sorted(text))
+
+    def multiply(self, chunk):
+        """Multiply a chunk by the factor, vectorized when it fits in int64"""
+        factor = self.factor
+        if (self.use_numpy and type(factor) is int and abs(factor) <= INT64_MAX
+                and all(type(item) is int for item in chunk)):
+            bound = max(abs(min(chunk)), abs(max(chunk)))
+            if bound * abs(factor) <= INT64_MAX:
+                return (np.array(chunk, dtype=np.int64) * factor).tolist()
+        return [item * factor for item in chunk]
+
+    def process(self, items):
+        """Lazily yield results for any iterable, one chunk in memory at a time"""
+        iterator = iter(items)
+        sort_digits = self.sort_digits
+
+        while True:
+            chunk = list(islice(iterator, self.chunk_size))
+            if not chunk:
+                return
+            yield from map(sort_digits, map(str, self.multiply(chunk)))
+
+    def run(self, items):
+        return list(self.process(items))
+
+    def cache_info(self):
+        return self.sort_digits.cache_info()
+
+# MEMBERSHIP INDEX
+
+class MembershipIndex:
+    """Picks a set, bitmap or sorted array for membership tests based on input shape"""
+
+    STRATEGIES = ('set', 'bitmap', 'sorted_array')
+
+    def __init__(self, items, strategy=None, use_numpy=None):
+        self.use_numpy = np is not None and use_numpy is not False
+        if not isinstance(items, (range, list, tuple)) and not (np is not None and isinstance(items, np.ndarray)):
+            items = list(items)  # Generators would be spent by the int check below
+        values = self._int_values(items)
+
+        if values is None:
+            self.domain = None
+            self.strategy = 'set'
+        else:
+            low = values[0] if len(values) else 0
+            high = values[-1] if len(values) else -1
+            self.domain = (int(low), int(high), len(values))
+            self.strategy = strategy or self.choose_strategy(*self.domain)
+
+        if self.strategy not in self.STRATEGIES:
+            raise ValueError(f"Unknown membership strategy: {self.strategy}")
+        if self.strategy != 'set' and values is None:
+            raise ValueError(f"{self.strategy} requires integer items")
+
+        if self.strategy == 'set':
+            self._set = set(items if values is None else values)
+        elif self.strategy == 'bitmap':
+            self._bits = self._build_bitmap(values)
+        else:
+            self._sorted = values if self.use_numpy else IntBuffer(values).memoryview()
+
+    def _int_values(self, items):
+        """Sorted unique int64 values, or None when the items are not all ints that fit"""
+        if isinstance(items, range) and items and not (
+                -INT64_MAX - 1 <= min(items) and max(items) <= INT64_MAX):
+            return None
+
+        if self.use_numpy:
+            if isinstance(items, range):
+                values = np.arange(items.start, items.stop, items.step, dtype=np.int64)
+                return values[::-1] if items.step < 0 else values
+            values = np.asarray(items)
+            if values.ndim != 1 or (values.size and values.dtype.kind not in 'iu'):
+                return None  # Ints beyond int64 come out as an object array
+            if values.size and values.dtype.kind == 'u' and values.max() > INT64_MAX:
+                return None
+            return np.unique(values.astype(np.int64, copy=False))
+
+        values = items if isinstance(items, range) else list(items)
+        if not all(type(value) is int and -INT64_MAX - 1 <= value <= INT64_MAX for value in values):
+            return None
+        if isinstance(values, range):
+            return sorted(values) if values.step < 0 else values
+        return sorted(set(values))
+
+    @staticmethod
+    def choose_strategy(low, high, count):
+        """Bitmap when it is no larger than a sorted array of the same values"""
+        span = high - low + 1
+        if count and span <= 8 * count:
+            return 'bitmap'
+        return 'sorted_array'
+
+    def _build_bitmap(self, values):
+        low, high, _ = self.domain
+        span = max(high - low + 1, 0)
+        if self.use_numpy:
+            bits = np.zeros(span, dtype=bool)
+            bits[values - low] = True
+            return bits
+
+        bits = bytearray(span)
+        for value in values:
+            bits[value - low] = 1
+        return bits
+
+    def __contains__(self, value):
+        if self.strategy == 'set':
+            return value in self._set
+
+        # Match list semantics for values like 3.0 that compare equal to an int
+        if type(value) is not int:
+            try:
+                as_int = int(value)
+            except (TypeError, ValueError, OverflowError):
+                return False
+            if as_int != value:
+                return False
+            value = as_int
+
+        if self.strategy == 'bitmap':
+            offset = value - self.domain[0]
+            return 0 <= offset < len(self._bits) and bool(self._bits[offset])
+
+        position = bisect_left(self._sorted, value)
+        return position < len(self._sorted) and self._sorted[position] == value
+
+    def contains_many(self, queries):
+        """Answer a batch of queries in one call; NumPy bool array when available"""
+        if not self.use_numpy or self.strategy == 'set':
+            return [value in self for value in queries]
+
+        queries = np.asarray(queries if hasattr(queries, '__len__') else list(queries))
+        if queries.ndim != 1 or queries.dtype.kind not in 'iu':
+            return np.array([value in self for value in queries.tolist()], dtype=bool)
+        # uint64 queries above INT64_MAX would wrap negative; none of them can be stored
+        too_large = queries > INT64_MAX if queries.dtype == np.uint64 else None
+        if too_large is not None:
+            queries = np.where(too_large, 0, queries)
+        queries = queries.astype(np.int64, copy=False)
+
+        if self.strategy == 'bitmap':
+            offsets = queries - self.domain[0]
+            hits = np.zeros(len(queries), dtype=bool)
+            in_range = (offsets >= 0) & (offsets < len(self._bits))
+            hits[in_range] = self._bits[offsets[in_range]]
+        elif not len(self._sorted):
+            hits = np.zeros(len(queries), dtype=bool)
+        else:
+            positions = np.searchsorted(self._sorted, queries)
+            clipped = np.minimum(positions, len(self._sorted) - 1)
+            hits = (positions < len(self._sorted)) & (self._sorted[clipped] == queries)
+
+        if too_large is not None:
+            hits &= ~too_large
+        return hits
+
+    def memory_footprint(self):
+        """Bytes used by the chosen representation: the whole set, or the bitmap/array payload"""
+        if self.strategy == 'set':
+            return sys.getsizeof(self._set)
+        storage = self._bits if self.strategy == 'bitmap' else self._sorted
+        # bytearray has no nbytes; it holds one byte per position, like the NumPy bool bitmap
+        return storage.nbytes if hasattr(storage, 'nbytes') else len(storage)
+
+    def footprints(self):
+        """Container bytes for every representation: measured for the chosen one, estimated otherwise"""
+        if self.domain is None:
+            return {'set': self.memory_footprint()}
+
+        low, high, count = self.domain
+        # CPython sets keep 16-byte entries in a power-of-two table at most 60% full
+        table = 8
+        while table * 3 < count * 5:
+            table *= 2
+
+        estimates = {
+            'set': sys.getsizeof(set()) + 16 * (table - 8),
+            'bitmap': max(high - low + 1, 0),
+            'sorted_array': 8 * count,
+        }
+        estimates[self.strategy] = self.memory_footprint()
+        return estimates
+
+# EFFICIENT COUNTERPARTS
+
+class EfficientPerformancePatterns:
+
+    def hash_join_equal_values(self, n=1000):
+        """O(n^2 + matches) equivalent of nested_loop_inefficiency"""
+        return EqualValueJoin.from_size(n).count()
+
+    def batched_expensive_operations(self, items):
+        """Hoisted, vectorized and memoized equivalent of repeated_expensive_operations"""
+        return ExpensiveOperationsPipeline().run(items)
+
+    def indexed_membership_testing(self, n=10000):
+        """Set/bitmap-backed equivalent of inefficient_membership_testing"""
+        index = MembershipIndex(range(n))
+        queries = range(n // 2)
+        return [i for i, hit in zip(queries, index.contains_many(queries)) if hit]
+
+    def buffered_list_building(self, n=10000):
+        """Amortized O(1) equivalent of list_concatenation_in_loop"""
+        buffer = IntBuffer()
+        append = buffer.append
+        for i in range(n):
+            append(i)
+        return buffer.to_list()
@@ -0,0 +1,519 @@
+"""
+Python Streaming Pipelines
+Lazy, memory-bounded replacements for the generators in MemoryAndPerformance.IteratorIssues
+"""
+
+import asyncio
+import codecs
+import concurrent.futures
+import functools
+import io
+import itertools
+import os
+import socket
+import tempfile
+import threading
+import time
+import tracemalloc
+
+# STREAM PIPELINE
+
+class Stream:
+    """Lazy pipeline; every stage keeps O(1) state except batch, which keeps one batch"""
+
+    def __init__(self, iterable):
+        self._iterable = iterable
+
+    # Sources
+
+    @classmethod
+    def range(cls, *args):
+        return cls(range(*args))
+
+    @classmethod
+    def count(cls, start=0, step=1):
+        """Unbounded source; pair it with take or take_while"""
+        return cls(itertools.count(start, step))
+
+    @classmethod
+    def cycle_range(cls, n):
+        """0..n-1 repeated forever without caching items, unlike itertools.cycle"""
+        if n <= 0:
+            raise ValueError("cycle_range needs a positive length")
+        return cls(itertools.chain.from_iterable(itertools.repeat(range(n))))
+
+    # Stages
+
+    def map(self, func):
+        return Stream(map(func, self._iterable))
+
+    def filter(self, predicate):
+        return Stream(filter(predicate, self._iterable))
+
+    def take(self, n):
+        return Stream(itertools.islice(self._iterable, n))
+
+    def skip(self, n):
+        return Stream(itertools.islice(self._iterable, n, None))
+
+    def take_while(self, predicate):
+        return Stream(itertools.takewhile(predicate, self._iterable))
+
+    def batch(self, size):
+        """Group items into tuples of at most size items"""
+        if size <= 0:
+            raise ValueError("batch size must be positive")
+
+        def batches(iterator):
+            while True:
+                chunk = tuple(itertools.islice(iterator, size))
+                if not chunk:
+                    return
+                yield chunk
+
+        return Stream(batches(iter(self._iterable)))
+
+    def __iter__(self):
+        return iter(self._iterable)
+
+    # Sinks
+
+    def reduce(self, func, initial):
+        return functools.reduce(func, self._iterable, initial)
+
+    def sum(self, start=0):
+        return sum(self._iterable, start)
+
+    def count_items(self):
+        return sum(1 for _ in self._iterable)
+
+    def min(self, default=None):
+        return min(self._iterable, default=default)
+
+    def max(self, default=None):
+        return max(self._iterable, default=default)
+
+    def last(self, default=None):
+        item = default
+        for item in self._iterable:
+            pass
+        return item
+
+    def for_each(self, func):
+        for item in self._iterable:
+            func(item)
+
+    def collect(self, limit=None):
+        """Materialize explicitly; the only sink whose memory grows with the stream"""
+        iterable = self._iterable if limit is None else itertools.islice(self._iterable, limit)
+        return list(iterable)
+
+# STREAMING ITERATORS
+
+class StreamingIterators:
+
+    def range_backed_generator(self):
+        """Same items as generator_memory_leak without the 1M-element list"""
+        # large_storage[i % len(large_storage)] is just i for i < 1000000
+        return Stream.range(1000).map(lambda i: i % 1000000)
+
+    def bounded_infinite_consumption(self, limit=1000000):
+        """Same values as infinite_generator_consumption, left lazy for a reducing sink"""
+        # The original breaks after index `limit`, so it keeps limit + 1 values
+        return Stream.cycle_range(100000).take(limit + 1)
+
+# ASYNC STREAMING
+
+_DONE = object()
+
+
+async def _close_source(iterator):
+    if hasattr(iterator, 'aclose'):
+        await iterator.aclose()
+    elif hasattr(iterator, 'close'):
+        iterator.close()
+
+
+class BoundedChannel:
+    """Producer task feeding any number of consumers through a bounded asyncio.Queue"""
+
+    def __init__(self, source, maxsize=1024):
+        if maxsize <= 0:
+            raise ValueError("BoundedChannel needs a positive maxsize for backpressure")
+        self._source = source
+        self._queue = asyncio.Queue(maxsize)
+        self._producer = None
+        self._error = None
+
+    def start(self):
+        if self._producer is not None:
+            raise RuntimeError("BoundedChannel is already running")
+        self._producer = asyncio.get_running_loop().create_task(self._produce())
+        return self
+
+    async def _produce(self):
+        source = self._source
+        iterator = source.__aiter__() if hasattr(source, '__aiter__') else iter(source)
+        try:
+            if hasattr(iterator, '__anext__'):
+                async for item in iterator:
+                    await self._queue.put(item)
+            else:
+                for item in iterator:
+                    await self._queue.put(item)  # Suspends only while the queue is full
+        except Exception as e:
+            self._error = e
+        finally:
+            await _close_source(iterator)
+        await self._queue.put(_DONE)
+
+    async def __aiter__(self):
+        while True:
+            item = await self._queue.get()
+            if item is _DONE:
+                # Pass the single end marker on so every other consumer stops too
+                self._queue.put_nowait(_DONE)
+                if self._error is not None:
+                    raise self._error
+                return
+            yield item
+
+    async def aclose(self):
+        """Cancel the producer, drop buffered items and release waiting consumers"""
+        producer = self._producer
+        if producer is not None and not producer.done():
+            producer.cancel()
+            # asyncio.wait does not re-raise the producer's cancellation into this task
+            await asyncio.wait([producer])
+        while not self._queue.empty():
+            self._queue.get_nowait()
+        self._queue.put_nowait(_DONE)
+
+    async def __aenter__(self):
+        return self.start()
+
+    async def __aexit__(self, *exc_info):
+        await self.aclose()
+
+
+async def iterate_in_thread(iterable, maxsize=8, chunk_size=256):
+    """Run a blocking iterator in a worker thread and yield its items on the event loop"""
+    loop = asyncio.get_running_loop()
+    queue = asyncio.Queue(maxsize)  # Holds at most maxsize chunks
+    stop = threading.Event()
+
+    def put(value):
+        future = asyncio.run_coroutine_threadsafe(queue.put(value), loop)
+        while True:
+            try:
+                return future.result(0.1)
+            except concurrent.futures.TimeoutError:
+                if stop.is_set():
+                    future.cancel()
+                    return
+
+    def produce():
+        error = None
+        try:
+            iterator = iter(iterable)
+            try:
+                while not stop.is_set():
+                    chunk = list(itertools.islice(iterator, chunk_size))
+                    if not chunk:
+                        break
+                    put((chunk, None))
+            finally:
+                close = getattr(iterator, 'close', None)
+                if close is not None:
+                    close()  # Runs the generator's own cleanup in the thread that drove it
+        except BaseException as e:
+            error = e
+        finally:
+            # Whatever happened, the consumer must get an end marker or it waits forever
+            if not stop.is_set():
+                put((None, error))
+
+    thread = threading.Thread(target=produce, name='iterate_in_thread', daemon=True)
+    thread.start()
+    try:
+        while True:
+            chunk, error = await queue.get()
+            if chunk is None:
+                if error is not None:
+                    raise error
+                return
+            for item in chunk:
+                yield item
+    finally:
+        stop.set()
+        # Dropping buffered chunks also unblocks a producer waiting on a full queue
+        while not queue.empty():
+            queue.get_nowait()
+
+
+class AsyncStreamingIterators:
+
+    async def range_backed_generator(self):
+        """Async counterpart of generator_memory_leak"""
+        for i in range(1000):
+            yield i % 1000000
+
+    async def bounded_infinite_consumption(self, limit=1000000, yield_every=1024):
+        """Async counterpart of infinite_generator_consumption, one value at a time"""
+        for index, value in enumerate(Stream.cycle_range(100000).take(limit + 1)):
+            yield value
+            if index % yield_every == yield_every - 1:
+                await asyncio.sleep(0)  # A consumer that never awaits must not starve the loop
+
+
+def benchmark_async_streaming(consumers=(1, 8, 64), items=100000, maxsize=1024):
+    """Items/s and traced peak memory for async and thread-bridged sources"""
+    expected = sum(Stream.cycle_range(100000).take(items))
+
+    def source(kind):
+        if kind == 'async':
+            return AsyncStreamingIterators().bounded_infinite_consumption(items - 1)
+        return iterate_in_thread(StreamingIterators().bounded_infinite_consumption(items - 1))
+
+    async def run(kind, count):
+        async def consume(channel):
+            total = 0
+            async for value in channel:
+                total += value
+            return total
+
+        async with BoundedChannel(source(kind), maxsize) as channel:
+            totals = await asyncio.gather(*(consume(channel) for _ in range(count)))
+        if sum(totals) != expected:
+            raise AssertionError("Consumers lost or duplicated items")
+
+    report = []
+    for kind in ('async', 'thread'):
+        for count in consumers:
+            started = time.perf_counter()
+            asyncio.run(run(kind, count))
+            elapsed = time.perf_counter() - started
+
+            # Peak is measured on a separate run; tracing would skew the throughput
+            tracemalloc.start()
+            try:
+                asyncio.run(run(kind, count))
+                _, peak = tracemalloc.get_traced_memory()
+            finally:
+                tracemalloc.stop()
+
+            report.append({
+                'source': kind,
+                'consumers': count,
+                'items_per_second': items / elapsed,
+                'peak_bytes': peak,
+            })
+
+    return {'items': items, 'maxsize': maxsize, 'runs': report}
+
+
+def benchmark_streaming(lengths=(10000, 100000, 1000000)):
+    """Peak traced memory of a map/filter/batch/sum pipeline versus building lists"""
+    report = []
+
+    for length in lengths:
+        tracemalloc.start()
+        try:
+            streamed = (
+                Stream.cycle_range(100000).take(length)
+                .map(lambda x: x * 2).filter(lambda x: x % 3).batch(1024)
+                .map(sum).sum()
+            )
+            _, stream_peak = tracemalloc.get_traced_memory()
+            tracemalloc.reset_peak()
+
+            values = [x * 2 for x in [i % 100000 for i in range(length)]]
+            kept = [x for x in values if x % 3]
+            materialized = sum(sum(kept[i:i + 1024]) for i in range(0, len(kept), 1024))
+            _, list_peak = tracemalloc.get_traced_memory()
+            del values, kept
+        finally:
+            tracemalloc.stop()
+
+        if streamed != materialized:
+            raise AssertionError("Streaming and list pipelines disagree")
+        report.append({'length': length, 'stream_peak': stream_peak, 'list_peak': list_peak})
+
+    return {'runs': report}
+
+# TEXT EMITTER
+
+class TextEmitter:
+    """Formats output into one reusable fixed-size buffer and flushes it in large blocks"""
+
+    def __init__(self, sink, buffer_size=1 << 20, encoding=None, errors=None):
+        if buffer_size <= 0:
+            raise ValueError("TextEmitter needs a positive buffer_size")
+        # A text sink's own encoding wins, so bytes written past its text layer still match it
+        text_sink = isinstance(sink, io.TextIOBase)
+        self.encoding = encoding or (text_sink and getattr(sink, 'encoding', None)) or 'utf-8'
+        self.errors = errors or (text_sink and getattr(sink, 'errors', None)) or 'strict'
+        self.bytes_written = 0
+        self.flushes = 0
+        self._buffer = bytearray(buffer_size)  # Allocated once, reused for every block
+        self._view = memoryview(self._buffer)
+        self._used = 0
+        self._send = self._sink_writer(sink, self.encoding, self.errors)
+
+    @staticmethod
+    def _sink_writer(sink, encoding, errors):
+        if isinstance(sink, int):
+            def send(view):
+                while view:
+                    view = view[os.write(sink, view):]
+            return send
+
+        if hasattr(sink, 'sendall'):
+            return sink.sendall
+
+        if isinstance(sink, io.TextIOBase):
+            target = getattr(sink, 'buffer', None)
+            sink_encoding = getattr(sink, 'encoding', None)
+            if target is None or sink_encoding is None or (
+                    codecs.lookup(sink_encoding).name != codecs.lookup(encoding).name):
+                # Pure text sinks such as StringIO, or a different encoding: go through the
+                # text layer; the incremental decoder keeps characters split across blocks intact
+                decoder = codecs.getincrementaldecoder(encoding)(errors)
+                return lambda view: sink.write(decoder.decode(view))
+
+            def send(view):
+                # Text already written to the wrapper must reach the buffer before this block
+                sink.flush()
+                target.write(view)
+            return send
+
+        def send(view):
+            while view:
+                count = sink.write(view)
+                # Raw files may accept only part of a block; buffered ones return None or all
+                view = view[count:] if count is not None else view[len(view):]
+        return send
+
+    def _write_bytes(self, data):
+        size = len(data)
+        if self._used + size > len(self._buffer):
+            self.flush()
+            if size > len(self._buffer):
+                self._send(memoryview(data))  # Larger than the buffer: no point copying it
+                self.bytes_written += size
+                return
+        self._view[self._used:self._used + size] = data
+        self._used += size
+
+    def write(self, text):
+        self._write_bytes(text.encode(self.encoding, self.errors) if isinstance(text, str) else text)
+
+    def writelines(self, lines):
+        for line in lines:
+            self.write(line)
+
+    def emit_formatted(self, template, values, batch_lines=4096):
+        """Write template % value for each value, e.g. b"Item %d with data\\n" % i"""
+        iterator = iter(values)
+        while True:
+            # One join per batch keeps the per-line work in C; the batch is bounded, not the output
+            block = b''.join([template % value for value in itertools.islice(iterator, batch_lines)])
+            if not block:
+                return
+            self._write_bytes(block)
+
+    def flush(self):
+        if self._used:
+            self._send(self._view[:self._used])
+            self.bytes_written += self._used
+            self.flushes += 1
+            self._used = 0
+
+    def close(self):
+        self.flush()
+        self._view.release()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+class StreamingOutput:
+
+    def streamed_string_building(self, sink, n=10000, buffer_size=1 << 20):
+        """Counterpart of proper_string_building that writes to sink; returns bytes written"""
+        with TextEmitter(sink, buffer_size) as emitter:
+            emitter.emit_formatted(b"Item %d with data\n", range(n))
+        return emitter.bytes_written
+
+
+def benchmark_text_emitter(sizes=(100000, 1000000, 3000000), buffer_size=1 << 20):
+    """Time and traced peak memory writing n report lines with each string-building strategy"""
+    from MemoryAndPerformance import PerformanceAntiPatterns, ProperResourceManagement
+
+    def concatenated(fd, n):
+        os.write(fd, PerformanceAntiPatterns().string_concatenation_in_loop(n).encode())
+
+    def joined(fd, n):
+        os.write(fd, ProperResourceManagement().proper_string_building(n).encode())
+
+    def emitted(fd, n):
+        StreamingOutput().streamed_string_building(fd, n, buffer_size)
+
+    strategies = {'concatenation': concatenated, 'join': joined, 'emitter': emitted}
+    report = []
+
+    with tempfile.TemporaryDirectory() as scratch:
+        path = os.path.join(scratch, 'report.txt')
+        for n in sizes:
+            expected = None
+            for name, strategy in strategies.items():
+                timings = []
+                for traced in (False, True):
+                    if traced:
+                        tracemalloc.start()
+                    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC)
+                    try:
+                        started = time.perf_counter()
+                        strategy(fd, n)
+                        timings.append(time.perf_counter() - started)
+                        peak = tracemalloc.get_traced_memory()[1] if traced else None
+                    finally:
+                        os.close(fd)
+                        if traced:
+                            tracemalloc.stop()
+
+                size = os.path.getsize(path)
+                if expected is not None and size != expected:
+                    raise AssertionError(f"{name} wrote {size} bytes, expected {expected}")
+                expected = size
+                report.append({'lines': n, 'strategy': name, 'bytes': size,
+                               'seconds': timings[0], 'peak_bytes': peak})
+
+    # Same stream over a socket to a draining reader
+    n = sizes[-1]
+    reader, writer = socket.socketpair()
+    received = [0]
+
+    def drain():
+        while True:
+            chunk = reader.recv(1 << 16)
+            if not chunk:
+                break
+            received[0] += len(chunk)
+
+    thread = threading.Thread(target=drain, name='drain', daemon=True)
+    thread.start()
+    started = time.perf_counter()
+    with writer:
+        StreamingOutput().streamed_string_building(writer, n, buffer_size)
+        writer.shutdown(socket.SHUT_WR)
+        thread.join()
+    elapsed = time.perf_counter() - started
+    reader.close()
+    report.append({'lines': n, 'strategy': 'emitter_socket', 'bytes': received[0],
+                   'seconds': elapsed, 'peak_bytes': None})
+
+    return {'buffer_size': buffer_size, 'runs': report}
@@ -0,0 +1,714 @@
+"""
+Python Syntax Checker
+Error-recovering, tokenizer-driven checker that reports every fault in SyntaxErrors.py in one pass
+"""
+
+import argparse
+import json
+import keyword
+import re
+import sys
+import time
+import unicodedata
+
+from MonitoringTools import fit_complexity
+
+# TOKENIZER
+
+_KEYWORDS = frozenset(keyword.kwlist)
+_ATOM_KEYWORDS = frozenset(('True', 'False', 'None'))
+_SOFT_KEYWORDS = frozenset(('match', 'case', 'type'))
+# Keywords that may directly follow a number (deprecated, but still valid syntax)
+_NUMBER_SUFFIX_KEYWORDS = frozenset(('and', 'else', 'for', 'if', 'in', 'is', 'not', 'or'))
+# Keywords that can only start a statement, so they always end an unclosed bracket
+_STATEMENT_KEYWORDS = frozenset((
+    'assert', 'break', 'class', 'continue', 'def', 'del', 'elif', 'except', 'finally',
+    'global', 'import', 'nonlocal', 'pass', 'raise', 'return', 'try', 'while', 'with',
+))
+_OPENERS = {'(': ')', '[': ']', '{': '}'}
+_CLOSERS = {')': '(', ']': '[', '}': '{'}
+_VALID_ESCAPES = frozenset('\n\\\'"abfnrtv01234567xNuU')
+
+_LINE_BREAK = re.compile(r'\r\n?|\n')
+_INDENT = re.compile(r'[ \t\f]*')
+_FIRST_WORD = re.compile(r'([ \t\f]*)(\w+|@)')
+_IDENTIFIER = re.compile(r'\w+')
+_ESCAPE = re.compile(r'\\(.)', re.DOTALL)
+_TOKEN = re.compile(r"""
+    (?P<space>[ \t\f]+)
+  | (?P<comment>\#.*)
+  | (?P<string>(?P<prefix>[rRbBuUfF]{1,2})?(?P<quote>'''|\"\"\"|'|"))
+  | (?P<number>
+        0[xX](?:_?[0-9a-fA-F])+ | 0[bB](?:_?[01])+ | 0[oO](?:_?[0-7])+
+      | (?:\d(?:_?\d)*(?:\.(?:\d(?:_?\d)*)?)? | \.\d(?:_?\d)*)(?:[eE][-+]?\d(?:_?\d)*)?[jJ]?
+    )
+  | (?P<name>[\w\u0080-\U0010ffff]+)  # Non-ASCII runs are validated with str.isidentifier()
+  | (?P<op>\.\.\.|->|\*\*=|//=|>>=|<<=|:=|[-+*/%@&|^<>=!]=|\*\*|//|<<|>>|[-+*/%@&|^~<>=.,:;()\[\]{}])
+  | (?P<continuation>\\$)
+  | (?P<other>.)
+""", re.VERBOSE)
+_STRING_END = {
+    "'": re.compile(r"(?:[^'\\]|\\.)*'"),
+    '"': re.compile(r'(?:[^"\\]|\\.)*"'),
+    "'''": re.compile(r"(?:[^'\\]|\\.|'(?!''))*'''"),
+    '"""': re.compile(r'(?:[^"\\]|\\.|"(?!""))*"""'),
+}
+
+
+def _issue(issues, line, col, message, severity='error'):
+    # Columns are 1-based, like SyntaxError.offset
+    issues.append({'line': line, 'column': col + 1, 'message': message, 'severity': severity})
+
+
+def _identifier_length(text):
+    """Length of the longest prefix of text that is a valid identifier"""
+    if unicodedata.normalize('NFKC', text).isidentifier():
+        return len(text)
+    length = 0
+    while length < len(text) and unicodedata.normalize('NFKC', text[:length + 1]).isidentifier():
+        length += 1
+    return length
+
+
+def _in_import_dots(tokens):
+    """True when the tokens so far end in 'from' (plus any dots) starting a statement"""
+    index = len(tokens) - 1
+    while index >= 0 and tokens[index][1] == '.':
+        index -= 1
+    return (index >= 0 and tokens[index][0] == 'NAME' and tokens[index][1] == 'from'
+            and (index == 0 or tokens[index - 1][1] in (';', ':')))
+
+
+def _indent_width(whitespace):
+    width = 0
+    for char in whitespace:
+        if char == '\t':
+            width = (width // 8 + 1) * 8
+        elif char == ' ':
+            width += 1
+        else:
+            width = 0  # A form feed resets the indentation count
+    return width
+
+
+def _check_escapes(text, start, stop, line, issues):
+    for match in _ESCAPE.finditer(text, start, stop):
+        if match.group(1) not in _VALID_ESCAPES:
+            _issue(issues, line, match.start(),
+                   f"invalid escape sequence '\\{match.group(1)}'", 'warning')
+
+
+def _logical_lines(source, issues):
+    """Yield (indent, first line, tokens, clean) per logical line; tokenizer faults go to issues"""
+    tokens = []         # (kind, text, line, col)
+    brackets = []       # Open brackets as (char, line, col)
+    string = None       # Open multi-line string as (quote, line, col, raw)
+    continued = False   # Previous line ended with a backslash
+    indent = first_line = lineno = 0
+    clean = True
+
+    for lineno, text in enumerate(_LINE_BREAK.split(source), 1):
+        pos = 0
+
+        if string is not None:
+            quote, string_line, string_col, raw = string
+            end = _STRING_END[quote].match(text)
+            if not raw:
+                _check_escapes(text, 0, len(text) if end is None else end.end(), lineno, issues)
+            if end is None:
+                continue
+            string = None
+            pos = end.end()
+            tokens.append(('STRING', quote, string_line, string_col))
+        elif brackets and not continued:
+            # Resynchronize: a statement keyword cannot continue a bracketed expression
+            word = _FIRST_WORD.match(text)
+            if word is not None and (
+                word.group(2) in _STATEMENT_KEYWORDS
+                or (word.group(2) == '@' and _indent_width(word.group(1)) <= indent)
+            ):
+                opener, line, col = brackets[0]
+                _issue(issues, line, col, f"'{opener}' was never closed")
+                brackets.clear()
+                yield indent, first_line, tokens, False
+                tokens = []
+
+        if not tokens and not continued:
+            leading = _INDENT.match(text)
+            pos = leading.end()
+            if pos == len(text) or text[pos] == '#':
+                continue  # Blank and comment-only lines never start a statement
+            indent = _indent_width(leading.group())
+            first_line = lineno
+            clean = True
+        continued = False
+
+        while pos < len(text):
+            match = _TOKEN.match(text, pos)
+            kind = match.lastgroup
+            value = match.group()
+
+            if kind == 'string':
+                quote = match.group('quote')
+                raw = 'r' in (match.group('prefix') or '').lower()
+                end = _STRING_END[quote].match(text, match.end())
+                if end is not None:
+                    if not raw:
+                        _check_escapes(text, match.end(), end.end() - len(quote), lineno, issues)
+                    tokens.append(('STRING', text[pos:end.end()], lineno, pos))
+                    pos = end.end()
+                    continue
+                if not raw:
+                    _check_escapes(text, match.end(), len(text), lineno, issues)
+                if len(quote) == 3 or text.endswith('\\'):
+                    string = (quote, lineno, pos, raw)
+                else:
+                    _issue(issues, lineno, pos,
+                           f"unterminated string literal (detected at line {lineno})")
+                    tokens.append(('STRING', text[pos:], lineno, pos))
+                    clean = False
+                break
+
+            if kind == 'number':
+                suffix = _IDENTIFIER.match(text, match.end())
+                if suffix is not None and suffix.group() not in _NUMBER_SUFFIX_KEYWORDS:
+                    _issue(issues, lineno, pos, "invalid decimal literal")
+                    tokens.append(('NAME', text[pos:suffix.end()], lineno, pos))
+                    clean = False
+                    pos = suffix.end()
+                    continue
+                tokens.append(('NUMBER', value, lineno, pos))
+            elif kind == 'name':
+                length = len(value) if value.isascii() else _identifier_length(value)
+                if length < len(value):
+                    # Stop at the first character that cannot continue the identifier
+                    if length:
+                        tokens.append(('NAME', value[:length], lineno, pos))
+                    char = value[length]
+                    _issue(issues, lineno, pos + length, f"invalid character '{char}' (U+{ord(char):04X})")
+                    clean = False
+                    pos += length + 1
+                    continue
+                tokens.append(('NAME', value, lineno, pos))
+            elif kind == 'op' and value == '...' and _in_import_dots(tokens):
+                # Relative import levels, as in "from ...pkg import name", not an Ellipsis
+                tokens.extend(('OP', '.', lineno, pos + offset) for offset in range(3))
+            elif kind == 'op':
+                if value in _OPENERS:
+                    brackets.append((value, lineno, pos))
+                elif value in _CLOSERS:
+                    if not brackets:
+                        _issue(issues, lineno, pos, f"unmatched '{value}'")
+                        clean = False
+                    else:
+                        opener, line, _ = brackets.pop()
+                        if opener != _CLOSERS[value]:
+                            where = f" on line {line}" if line != lineno else ""
+                            _issue(issues, lineno, pos, f"closing parenthesis '{value}' does not "
+                                                        f"match opening parenthesis '{opener}'{where}")
+                            clean = False
+                tokens.append(('OP', value, lineno, pos))
+            elif kind == 'continuation':
+                continued = True
+            elif kind == 'other':
+                if value == '\\':
+                    _issue(issues, lineno, pos, "unexpected character after line continuation character")
+                else:
+                    _issue(issues, lineno, pos, f"invalid character '{value}' (U+{ord(value):04X})")
+                clean = False
+            pos = match.end()
+
+        if string is None and not continued and not brackets and tokens:
+            yield indent, first_line, tokens, clean
+            tokens = []
+
+    if string is not None:
+        quote, line, col, _ = string
+        kind = 'triple-quoted string literal' if len(quote) == 3 else 'string literal'
+        _issue(issues, line, col, f"unterminated {kind} (detected at line {lineno})")
+        clean = False
+    if brackets:
+        opener, line, col = brackets[0]
+        _issue(issues, line, col, f"'{opener}' was never closed")
+        clean = False
+    if tokens:
+        yield indent, first_line, tokens, clean
+
+# STATEMENT CHECKS
+
+_RECOVERED = 'recovered'  # Block entered after an indentation error; context checks are skipped
+_COMPOUND_KEYWORDS = frozenset((
+    'class', 'def', 'elif', 'else', 'except', 'finally', 'for', 'if', 'try', 'while', 'with',
+))
+_NEEDS_OPERAND = frozenset((
+    '+', '-', '/', '//', '%', '@', '&', '|', '^', '~', '<<', '>>', '<', '>', '==', '!=', '<=', '>=',
+    '=', ':=', '+=', '-=', '*=', '/=', '//=', '%=', '@=', '&=', '|=', '^=', '<<=', '>>=', '**=',
+    '.', 'and', 'in', 'is', 'not', 'or',
+))
+_NOT_AN_OPERAND = frozenset((')', ']', '}', ',', ':', '='))
+_TARGET_OPS = frozenset(('.', ',', '*', '(', ')', '[', ']', '{', '}'))
+
+
+def _split_statements(tokens):
+    """Split a logical line on top-level semicolons"""
+    depth = 0
+    statement = []
+    for token in tokens:
+        if token[0] == 'OP':
+            text = token[1]
+            if text in _OPENERS:
+                depth += 1
+            elif text in _CLOSERS:
+                depth = max(depth - 1, 0)
+            elif text == ';' and depth == 0:
+                if statement:
+                    yield statement
+                statement = []
+                continue
+        statement.append(token)
+    if statement:
+        yield statement
+
+
+def _ends_atom(token):
+    kind, text = token[0], token[1]
+    if kind == 'NAME':
+        return text not in _KEYWORDS or text in _ATOM_KEYWORDS
+    return kind in ('NUMBER', 'STRING') or text in _CLOSERS or text == '...'
+
+
+def _starts_atom(token):
+    kind, text = token[0], token[1]
+    if kind == 'NAME':
+        return text not in _KEYWORDS or text in _ATOM_KEYWORDS
+    return kind in ('NUMBER', 'STRING') or text == '...'
+
+
+def _at(token, message):
+    return token[2], token[3], message
+
+
+def _after(token, message):
+    return token[2], token[3] + len(token[1]), message
+
+
+def _scan(tokens, function, is_def=False, warnings=None):
+    """One pass over an expression-bearing statement; returns the first error or None"""
+    depth = 0
+    pending = []  # (depth, token) for each 'for' still waiting for its 'in'
+    # [opener token, holds a 'for', first stray 'await'] per open bracket; an 'await' is only
+    # an error once its bracket closes without turning out to be a comprehension
+    brackets = []
+    lambdas = []  # Depth of each lambda whose parameter list is still open
+    previous = None
+    in_lambda = False  # A lambda body is a function, so 'yield' becomes legal there
+    soft = bool(tokens) and tokens[0][1] in _SOFT_KEYWORDS
+    outside = 'async function' if function == 'def' else 'function'
+
+    for index, token in enumerate(tokens):
+        kind, text = token[0], token[1]
+        # Like a def, a lambda parameter list may hold a bare '/' marker
+        in_parameters = is_def or bool(lambdas)
+
+        if kind == 'OP':
+            if text in _OPENERS:
+                depth += 1
+                brackets.append([token, False, None])
+            elif text in _CLOSERS:
+                if pending and pending[-1][0] == depth:
+                    return _at(pending[-1][1], "expected 'in' after 'for'")
+                depth = max(depth - 1, 0)
+                if brackets:
+                    opener, comprehension, awaited = brackets.pop()
+                    if comprehension and awaited is not None and opener[1] != '(':
+                        # Generator expressions may await anywhere; other comprehensions may not
+                        return _at(opener, "asynchronous comprehension outside of an "
+                                           "asynchronous function")
+                    if not comprehension and awaited is not None:
+                        if not brackets:
+                            return _at(awaited, f"'await' outside {outside}")
+                        brackets[-1][2] = brackets[-1][2] or awaited
+            elif text == ':' and lambdas and lambdas[-1] == depth:
+                lambdas.pop()
+        elif kind == 'NAME':
+            if text == 'for':
+                pending.append((depth, token))
+                if brackets:
+                    brackets[-1][1] = True
+            elif text == 'in' and pending and pending[-1][0] == depth:
+                pending.pop()
+            elif text == 'await' and function not in ('async', _RECOVERED):
+                if not brackets:
+                    return _at(token, f"'await' outside {outside}")
+                brackets[-1][2] = brackets[-1][2] or token
+            elif text == 'lambda':
+                in_lambda = True
+                lambdas.append(depth)
+            elif text == 'yield' and function is None and not in_lambda:
+                return _at(token, "'yield' outside function")
+
+        if previous is not None:
+            if (_ends_atom(previous) and _starts_atom(token)
+                    and not (previous[0] == kind == 'STRING') and not (soft and index == 1)):
+                if tokens[0][1] == 'except':
+                    return _at(previous, "multiple exception types must be parenthesized")
+                return _at(previous, "invalid syntax. Perhaps you forgot a comma?")
+            if (previous[0] != 'STRING' and previous[1] in _NEEDS_OPERAND
+                    and kind == 'OP' and text in _NOT_AN_OPERAND
+                    and not (in_parameters and previous[1] == '/')):
+                return _after(previous, f"expected expression after '{previous[1]}'")
+            if previous[0] == 'NUMBER' and text == '(' and warnings is not None:
+                number = previous[1].lower()
+                if number.endswith('j'):
+                    type_name = 'complex'
+                elif not number.startswith('0x') and ('.' in number or 'e' in number):
+                    type_name = 'float'
+                else:
+                    type_name = 'int'
+                warnings.append(_at(previous, f"'{type_name}' object is not callable; "
+                                              "perhaps you missed a comma?"))
+        previous = token
+
+    if previous is not None and previous[0] != 'STRING' and previous[1] in _NEEDS_OPERAND:
+        return _after(previous, f"expected expression after '{previous[1]}'")
+    if pending:
+        return _at(pending[-1][1], "expected 'in' after 'for'")
+    for _, _, awaited in brackets:
+        if awaited is not None:
+            return _at(awaited, f"'await' outside {outside}")
+    return None
+
+
+def _check_target(tokens):
+    """Validate the target of a plain assignment, the part before its first top-level '='"""
+    depth = 0
+    openers = []
+    call = False
+    problem = None  # Only an error once a top-level '=' shows this really is a target
+    for index, token in enumerate(tokens):
+        kind, text = token[0], token[1]
+        if kind == 'OP':
+            if text in _OPENERS:
+                openers.append(index)
+                depth += 1
+                continue
+            if text in _CLOSERS:
+                opened = openers.pop() if openers else 0
+                depth = max(depth - 1, 0)
+                call = text == ')' and opened > 0 and _ends_atom(tokens[opened - 1])
+                continue
+            if depth:
+                continue
+            if text == '=':
+                if problem is None and call:
+                    problem = _at(tokens[0], "cannot assign to function call here. "
+                                             "Maybe you meant '==' instead of '='?")
+                return problem
+            if text == ':':
+                return None  # Annotated assignment; the annotation is an expression
+            if text not in _TARGET_OPS and problem is None:
+                problem = _at(tokens[0], "cannot assign to expression here. "
+                                         "Maybe you meant '==' instead of '='?")
+        elif depth:
+            continue
+        elif text == 'lambda':
+            return None  # Any '=' from here on is a lambda default
+        elif problem is None:
+            if kind in ('NUMBER', 'STRING'):
+                # Only a bare literal target; "a".__class__ = X assigns to an attribute
+                if ((not index or tokens[index - 1][1] == ',')
+                        and index + 1 < len(tokens) and tokens[index + 1][1] in ('=', ',')):
+                    problem = _at(token, "cannot assign to literal here. "
+                                         "Maybe you meant '==' instead of '='?")
+            elif text in _ATOM_KEYWORDS:
+                problem = _at(token, f"cannot assign to {text}")
+            elif text in _KEYWORDS and index:
+                problem = _at(tokens[0], "cannot assign to expression here. "
+                                         "Maybe you meant '==' instead of '='?")
+        call = False
+    return None
+
+
+def _header_colon(tokens, start):
+    """Index of the colon ending a compound statement header, skipping lambda colons"""
+    depth = 0
+    lambdas = 0
+    for index in range(start, len(tokens)):
+        kind, text = tokens[index][0], tokens[index][1]
+        if kind == 'OP':
+            if text in _OPENERS:
+                depth += 1
+            elif text in _CLOSERS:
+                depth = max(depth - 1, 0)
+            elif text == ':' and not depth:
+                if not lambdas:
+                    return index
+                lambdas -= 1
+        elif text == 'lambda' and not depth:
+            lambdas += 1
+    return None
+
+
+def _compound_keyword(tokens):
+    """(keyword, index of keyword, is_async) for a compound statement header, else None"""
+    first = tokens[0]
+    if first[0] != 'NAME':
+        return None
+    if first[1] == 'async' and len(tokens) > 1 and tokens[1][1] in ('def', 'for', 'with'):
+        return tokens[1][1], 1, True
+    if first[1] in _COMPOUND_KEYWORDS:
+        return first[1], 0, False
+    if (first[1] in ('match', 'case') and len(tokens) > 2 and tokens[-1][1] == ':'
+            and tokens[1][1] not in ('=', ':', '.', ',', ')', ']', '}')):
+        return first[1], 0, False
+    return None
+
+# SYNTAX CHECKER
+
+class SyntaxChecker:
+    """Reports every syntax fault in a source file, with line and column, in one linear pass"""
+
+    def __init__(self, warnings=True):
+        self.warnings = warnings
+
+    def check(self, source):
+        """List of issue dicts (line, column, message, severity) sorted by position"""
+        issues = []
+        warnings = [] if self.warnings else None
+        blocks = [(0, None)]  # (indent, enclosing function kind) for each open block
+        expecting = None      # (header line, label, inner kind, strict) after a block header
+
+        for indent, line, tokens, clean in _logical_lines(source, issues):
+            first = tokens[0]
+            if expecting is not None and indent > blocks[-1][0]:
+                blocks.append((indent, expecting[2]))
+            else:
+                if expecting is not None and expecting[3]:
+                    _issue(issues, first[2], first[3],
+                           f"expected an indented block after {expecting[1]} on line {expecting[0]}")
+                if expecting is None and indent > blocks[-1][0]:
+                    _issue(issues, first[2], first[3], "unexpected indent")
+                    blocks.append((indent, _RECOVERED))
+                else:
+                    while blocks[-1][0] > indent:
+                        blocks.pop()
+                    if blocks[-1][0] != indent:
+                        _issue(issues, first[2], first[3],
+                               "unindent does not match any outer indentation level")
+                        blocks.append((indent, blocks[-1][1]))
+
+            expecting = self._check_line(tokens, line, blocks[-1][1], clean, issues, warnings)
+
+        if expecting is not None and expecting[3]:
+            _issue(issues, source.count('\n') + 1, 0,
+                   f"expected an indented block after {expecting[1]} on line {expecting[0]}")
+
+        for line, col, message in warnings or ():
+            _issue(issues, line, col, message, 'warning')
+        issues.sort(key=lambda issue: (issue['line'], issue['column']))
+        if not self.warnings:
+            issues = [issue for issue in issues if issue['severity'] == 'error']
+        return issues
+
+    def check_file(self, path):
+        with open(path, encoding='utf-8') as f:
+            return self.check(f.read())
+
+    def _check_line(self, tokens, line, function, clean, issues, warnings):
+        """Check one logical line; returns the block expectation if it ends in a header"""
+        expecting = None
+
+        for index, statement in enumerate(_split_statements(tokens)):
+            header = _compound_keyword(statement) if index == 0 else None
+            if header is None:
+                error = self._simple_statement(statement, function, warnings) if clean else None
+            else:
+                error, expecting, function = self._header(statement, line, header, function,
+                                                          warnings)
+                if not clean:
+                    error = None
+                    expecting = expecting and expecting[:3] + (False,)
+            if error is not None:
+                _issue(issues, *error)
+
+        return expecting
+
+    def _header(self, tokens, line, header, function, warnings):
+        """Returns (first error, block expectation, function kind for an inline body)"""
+        keyword_name, start, is_async = header
+        if keyword_name == 'def':
+            inner = 'async' if is_async else 'def'
+            label = 'function definition'
+        elif keyword_name == 'class':
+            inner = None
+            label = 'class definition'
+        else:
+            inner = function
+            label = f"'{keyword_name}' statement"
+
+        error = None
+        following = tokens[start + 1] if start + 1 < len(tokens) else None
+        if is_async and keyword_name != 'def' and function not in ('async', _RECOVERED):
+            error = _at(tokens[0], f"'async {keyword_name}' outside async function")
+        elif keyword_name in ('def', 'class') and (
+                following is None or following[0] != 'NAME' or following[1] in _KEYWORDS):
+            error = _after(tokens[start], f"expected {keyword_name.replace('def', 'function')} "
+                                          f"name after '{keyword_name}'")
+        elif keyword_name == 'def' and (start + 2 >= len(tokens) or tokens[start + 2][1] != '('):
+            error = _after(following, "expected '(' after function name")
+
+        colon = _header_colon(tokens, start)
+        if error is None and colon is None:
+            error = _after(tokens[-1], "expected ':'")
+        if error is None:
+            error = _scan(tokens[start:colon], function, keyword_name == 'def', warnings)
+
+        if colon is not None and colon < len(tokens) - 1:
+            # Inline body such as "if ready: return value"
+            if error is None:
+                error = self._simple_statement(tokens[colon + 1:], inner, warnings)
+            return error, None, inner
+
+        # A malformed header only opens a block if the next line is actually indented
+        return error, (line, label, inner, error is None), function
+
+    def _simple_statement(self, tokens, function, warnings):
+        first = tokens[0]
+        text = first[1]
+
+        if first[0] == 'OP' and text == '@':
+            if len(tokens) == 1:
+                return _after(first, "expected expression after '@'")
+            return _scan(tokens[1:], function, warnings=warnings)
+        if first[0] == 'NAME':
+            if text == 'import':
+                if len(tokens) == 1:
+                    return _after(first, "expected module name after 'import'")
+                if tokens[1][1] == '.':
+                    return _at(tokens[1], "relative imports must use 'from . import name'")
+            elif text == 'from':
+                names = next((i for i, token in enumerate(tokens) if token[1] == 'import'), None)
+                if names is None:
+                    return _after(tokens[-1], "expected 'import' after 'from' module")
+                if names == len(tokens) - 1:
+                    return _after(tokens[-1], "expected names after 'import'")
+            elif text == 'return' and function is None:
+                return _at(first, "'return' outside function")
+
+        error = _check_target(tokens)
+        if error is not None:
+            return error
+        return _scan(tokens, function, warnings=warnings)
+
+# BENCHMARK
+
+_FAULT_TEMPLATES = (
+    # (source, offset of the faulty line within the snippet)
+    ('def missing_colon_{n}()\n    return {n}\n', 0),
+    ('def unclosed_{n}():\n    total = (1 + {n}\n    return total\n', 1),
+    ('def unterminated_{n}():\n    text = "unterminated {n}\n    return text\n', 1),
+    ('def decimal_{n}():\n    {n}value = {n}\n    return 0\n', 1),
+    ('def missing_comma_{n}(first second):\n    return first\n', 0),
+    ('def bad_target_{n}():\n    my-var = {n}\n    return 0\n', 1),
+    ('def not_async_{n}():\n    return await fetch({n})\n', 1),
+    ('def bad_comprehension_{n}():\n    return [x for x in]\n', 1),
+    ('def print_statement_{n}():\n    print "value {n}"\n', 1),
+    ('from module_{n}\n', 0),
+)
+_CLEAN_TEMPLATE = ('def clean_{n}(values):\n    total = 0\n    for value in values:\n'
+                   '        total += value * {n}\n    return total\n')
+
+
+def generate_faulty_source(faults, clean_per_fault=3):
+    """Source with `faults` independent syntax errors; returns (source, faulty line numbers)"""
+    parts = []
+    expected = []
+    line = 1
+    for n in range(faults):
+        template, offset = _FAULT_TEMPLATES[n % len(_FAULT_TEMPLATES)]
+        snippet = template.format(n=n)
+        parts.append(snippet)
+        expected.append(line + offset)
+        line += snippet.count('\n')
+        for c in range(clean_per_fault):
+            snippet = _CLEAN_TEMPLATE.format(n=n * clean_per_fault + c)
+            parts.append(snippet)
+            line += snippet.count('\n')
+    return ''.join(parts), expected
+
+
+def compile_until_clean(source, max_rounds=None):
+    """Baseline: one compile() per error, neutralizing each reported line before retrying"""
+    lines = source.split('\n')
+    found = []
+    for _ in range(len(lines) if max_rounds is None else max_rounds):
+        try:
+            compile('\n'.join(lines), '<generated>', 'exec')
+            break
+        except SyntaxError as e:
+            if not e.lineno:
+                break
+            found.append((e.lineno, e.offset, e.msg))
+            index = e.lineno - 1
+            # Reported again on a neutralized line, the fault began earlier (an unclosed bracket)
+            while index > 0 and lines[index].strip() in ('', 'pass'):
+                index -= 1
+            text = lines[index]
+            # A stray indented line is dropped; anything else becomes a no-op at its own indent
+            lines[index] = ('' if e.msg == 'unexpected indent'
+                            else text[:len(text) - len(text.lstrip())] + 'pass')
+    return found
+
+
+def benchmark_syntax_checker(sizes=(250, 500, 1000, 2000, 4000), baseline_limit=500):
+    """Checker time against file size, with the compile-per-error baseline on smaller files"""
+    checker = SyntaxChecker(warnings=False)
+    runs = []
+    for faults in sizes:
+        source, expected = generate_faulty_source(faults)
+        started = time.perf_counter()
+        issues = checker.check(source)
+        elapsed = time.perf_counter() - started
+
+        reported = {issue['line'] for issue in issues}
+        run = {
+            'faults': faults,
+            'lines': source.count('\n'),
+            'errors_reported': len(issues),
+            'missed': len(set(expected) - reported),
+            'unexpected': len(reported - set(expected)),
+            'checker_seconds': elapsed,
+            'microseconds_per_line': elapsed / source.count('\n') * 1e6,
+        }
+        if faults <= baseline_limit:
+            started = time.perf_counter()
+            run['compile_rounds'] = len(compile_until_clean(source))
+            run['compile_seconds'] = time.perf_counter() - started
+        runs.append(run)
+
+    fit = fit_complexity([run['lines'] for run in runs], [run['checker_seconds'] for run in runs])
+    return {'runs': runs, 'checker_fit': fit['best_fit']}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Report every syntax error in Python files")
+    parser.add_argument('paths', nargs='+', help="Python source files to check")
+    parser.add_argument('--no-warnings', action='store_true', help="Only report errors")
+    parser.add_argument('--json', action='store_true', help="Emit one JSON object per issue")
+    args = parser.parse_args(argv)
+
+    checker = SyntaxChecker(warnings=not args.no_warnings)
+    failed = False
+    for path in args.paths:
+        for issue in checker.check_file(path):
+            failed = failed or issue['severity'] == 'error'
+            if args.json:
+                print(json.dumps(dict(issue, path=path)))
+            else:
+                print(f"{path}:{issue['line']}:{issue['column']}: "
+                      f"{issue['severity']}: {issue['message']}")
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,52 @@
+"""
+Anti-Pattern Detector Tests
+Loop-invariant call detection, its invalidation by calls that may mutate, and concatenation in loops
+"""
+
+from AntiPatternDetector import detect_anti_patterns
+
+
+def patterns(source):
+    return [(finding['line'], finding['pattern']) for finding in detect_anti_patterns(source)]
+
+# LOOP-INVARIANT CALLS
+
+def test_invariant_builtin_call_is_reported():
+    source = 'def f(data, items):\n    for item in items:\n        max(data)\n'
+    assert patterns(source) == [(3, 'repeated_expensive_operations')]
+
+
+def test_argument_to_unknown_call_may_change():
+    source = 'def f(data, items):\n    for item in items:\n        helper(data)\n        max(data)\n'
+    assert patterns(source) == []
+
+
+def test_keyword_argument_to_unknown_call_may_change():
+    source = 'def f(data, items):\n    for item in items:\n        fill(out=data)\n        max(data)\n'
+    assert patterns(source) == []
+
+
+def test_method_receiver_may_change():
+    source = 'def f(data, items):\n    for item in items:\n        data.append(item)\n        max(data)\n'
+    assert patterns(source) == []
+
+
+def test_pure_builtin_arguments_stay_invariant():
+    source = 'def f(data, items):\n    for item in items:\n        len(data)\n        max(data)\n'
+    assert patterns(source) == [(4, 'repeated_expensive_operations')]
+
+# CONCATENATION IN LOOPS
+
+def test_inplace_add_to_a_list_is_extend():
+    source = 'def f(items):\n    lst = []\n    for item in items:\n        lst += "s"\n        lst += [item]\n    return lst\n'
+    assert patterns(source) == []
+
+
+def test_inplace_add_to_a_str_is_reported():
+    source = 'def f(items):\n    text = ""\n    for item in items:\n        text += item\n    return text\n'
+    assert patterns(source) == [(4, 'string_concatenation_in_loop')]
+
+
+def test_rebinding_a_list_to_a_longer_copy_is_reported():
+    source = 'def f(items):\n    lst = []\n    for item in items:\n        lst = lst + [item]\n    return lst\n'
+    assert patterns(source) == [(4, 'list_concatenation_in_loop')]
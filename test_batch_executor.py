@@ -0,0 +1,53 @@
+"""
+Batch Executor Tests
+Results across processes match the serial run for every kind of input
+"""
+
+from array import array
+
+import pytest
+
+from BatchExecutor import BatchExecutor, SharedArray, _numeric_array, expensive_operations_range
+from MemoryAndPerformance import PerformanceAntiPatterns
+
+INPUTS = {
+    'int64': list(range(40)),
+    'float': [i * 0.5 for i in range(40)],
+    'beyond_int64': [2 ** 70 + i for i in range(40)],
+    'mixed': [1, 2.5] * 20,
+    'tuple': tuple(range(40)),
+    'array': array('i', range(40)),
+}
+
+# SHARED ARRAYS
+
+def test_typecode_follows_the_values():
+    assert _numeric_array([1, 2])[1] == 'q'
+    assert _numeric_array([1.0, 2.5])[1] == 'd'
+    assert _numeric_array(array('f', [1.5]))[1] == 'd'
+    assert _numeric_array([2 ** 63]) is None
+    assert _numeric_array([1, 2.5]) is None
+    assert _numeric_array([True]) is None
+
+
+def test_shared_array_rejects_values_it_cannot_hold():
+    with pytest.raises(ValueError):
+        SharedArray([2 ** 70])
+    with SharedArray([0.25, 0.5]) as shared:
+        assert shared.descriptor()[1:] == ('d', 2)
+
+# BATCH EXECUTOR
+
+@pytest.mark.parametrize('share_inputs', [True, False])
+def test_results_match_the_serial_run(share_inputs):
+    anti_patterns = PerformanceAntiPatterns()
+    with BatchExecutor(2, share_inputs=share_inputs) as executor:
+        for name, values in INPUTS.items():
+            expected = anti_patterns.repeated_expensive_operations(list(values))
+            assert executor.run(expensive_operations_range, values) == expected, name
+
+
+def test_generators_are_consumed_once():
+    with BatchExecutor(2) as executor:
+        result = executor.run(expensive_operations_range, (i for i in range(10)))
+    assert result == PerformanceAntiPatterns().repeated_expensive_operations(list(range(10)))
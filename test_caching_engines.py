@@ -0,0 +1,141 @@
+"""
+Caching Engine Tests
+Single-flight computation, expiry and size bounds of the bounded cache, and the two-tier weak-value cache
+"""
+
+import gc
+import threading
+import time
+
+import pytest
+
+from CachingEngines import BoundedCache, TwoTierCache
+
+
+class FakeClock:
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+# BOUNDED CACHE
+
+def test_concurrent_misses_run_the_loader_once():
+    cache = BoundedCache()
+    release = threading.Event()
+    calls = []
+
+    def load():
+        calls.append(threading.get_ident())
+        release.wait(5)
+        return 'value'
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(cache.get_or_compute('key', load)))
+               for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    deadline = time.monotonic() + 5
+    while cache.misses < len(threads) and time.monotonic() < deadline:
+        time.sleep(0.001)  # Every caller has missed and joined the flight
+    release.set()
+    for thread in threads:
+        thread.join()
+
+    assert len(calls) == 1
+    assert results == ['value'] * len(threads)
+    assert cache.get_or_compute('key', load) == 'value'
+    assert len(calls) == 1
+
+
+def test_loader_errors_are_not_cached():
+    cache = BoundedCache()
+
+    def fail():
+        raise KeyError('boom')
+
+    with pytest.raises(KeyError):
+        cache.get_or_compute('key', fail)
+    assert 'key' not in cache
+    assert cache.get_or_compute('key', lambda: 1) == 1
+
+
+def test_entries_expire_after_ttl():
+    clock = FakeClock()
+    cache = BoundedCache(ttl=10, clock=clock)
+    cache.put('key', 'value')
+
+    clock.now = 9.9
+    assert cache.get('key') == 'value'
+    clock.now = 10.0
+    assert cache.get('key') is None
+    assert cache.expirations == 1
+    assert cache.stats()['bytes'] == 0
+
+
+def test_byte_limit_evicts_least_recently_used():
+    cache = BoundedCache(max_entries=None, max_bytes=100, sizer=len)
+    cache.put('a', 'x' * 40)
+    cache.put('b', 'x' * 40)
+    cache.get('a')  # b is now the least recently used
+    cache.put('c', 'x' * 40)
+
+    assert 'a' in cache and 'c' in cache and 'b' not in cache
+    assert cache.bytes == 80
+    assert cache.evictions == 1
+
+
+def test_values_larger_than_the_byte_limit_are_not_stored():
+    cache = BoundedCache(max_bytes=10, sizer=len)
+    cache.put('small', 'x' * 5)
+    cache.put('huge', 'x' * 50)
+    assert 'huge' not in cache
+    assert 'small' in cache
+    assert cache.bytes == 5
+
+# TWO-TIER CACHE
+
+def test_only_the_strong_tier_keeps_values_alive():
+    cache = TwoTierCache(strong_size=2)
+    for i in range(5):
+        cache.put(i, {'id': i})
+    gc.collect()
+
+    assert len(cache) == 2
+    assert cache.get(0) is None
+    assert cache.get(4) == {'id': 4}
+    assert cache.stats()['misses'] == 1
+
+
+def test_values_alive_elsewhere_are_found_and_promoted():
+    cache = TwoTierCache(strong_size=1)
+    held = cache.put('held', [1, 2, 3])
+    cache.put('other', [4])  # Pushes 'held' out of the strong tier
+
+    assert cache.get('held') is held
+    assert cache.weak_hits == 1
+    del held
+    gc.collect()
+    assert cache.get('held') == [1, 2, 3]  # Promotion made the cache an owner again
+    assert cache.strong_hits == 1
+
+
+def test_get_or_create_builds_once_per_live_value():
+    cache = TwoTierCache()
+    calls = []
+
+    def build():
+        calls.append(1)
+        return {'built': len(calls)}
+
+    first = cache.get_or_create('key', build)
+    assert cache.get_or_create('key', build) is first
+    assert len(calls) == 1
+
+
+def test_values_that_cannot_be_weakly_referenced_are_rejected():
+    cache = TwoTierCache()
+    with pytest.raises(TypeError):
+        cache.put('key', 42)
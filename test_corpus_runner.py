@@ -0,0 +1,88 @@
+"""
+Corpus Runner Tests
+Result cache hits and invalidation by file content and analyzer version
+"""
+
+import os
+
+from AntiPatternDetector import detect_anti_patterns
+from CorpusRunner import ANALYZERS, Analyzer, CorpusRunner, check_python_syntax, source_version
+from SyntaxChecker import SyntaxChecker
+
+
+def count_lines(source):
+    return [{'line': 1, 'column': 1, 'severity': 'info', 'message': f"{source.count(chr(10))} lines"}]
+
+
+def write(path, text):
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(text)
+
+
+def run(cache_dir, corpus, version='1'):
+    runner = CorpusRunner(cache_dir, workers=1, analyzers=[Analyzer('lines', version, ('.py',), count_lines)])
+    results = {os.path.basename(result['path']): result for result in runner.run([corpus])}
+    return runner, results
+
+
+def make_corpus(tmp_path):
+    corpus = tmp_path / 'corpus'
+    corpus.mkdir()
+    write(corpus / 'a.py', "x = 1\n")
+    write(corpus / 'b.py', "y = 2\nz = 3\n")
+    return corpus
+
+# RESULT CACHE
+
+def test_second_run_is_served_from_the_cache(tmp_path):
+    corpus = make_corpus(tmp_path)
+    cache_dir = str(tmp_path / 'cache')
+
+    cold, first = run(cache_dir, corpus)
+    assert cold.stats['analyzed'] == 2 and cold.stats['cached'] == 0
+
+    warm, second = run(cache_dir, corpus)
+    assert warm.stats['analyzed'] == 0 and warm.stats['cached'] == 2
+    for name, result in second.items():
+        assert result['cached']
+        assert result['issues'] == first[name]['issues']
+
+
+def test_changed_file_is_reanalyzed(tmp_path):
+    corpus = make_corpus(tmp_path)
+    cache_dir = str(tmp_path / 'cache')
+    run(cache_dir, corpus)
+
+    write(corpus / 'a.py', "x = 1\nw = 4\n")
+    runner, results = run(cache_dir, corpus)
+    assert runner.stats['analyzed'] == 1 and runner.stats['cached'] == 1
+    assert not results['a.py']['cached']
+    assert results['a.py']['issues'][0]['message'] == "2 lines"
+    assert results['b.py']['cached']
+
+
+def test_version_change_invalidates_every_result(tmp_path):
+    corpus = make_corpus(tmp_path)
+    cache_dir = str(tmp_path / 'cache')
+    run(cache_dir, corpus, version='1')
+
+    runner, results = run(cache_dir, corpus, version='2')
+    assert runner.stats['analyzed'] == 2 and runner.stats['cached'] == 0
+    assert not any(result['cached'] for result in results.values())
+
+# ANALYZER VERSIONS
+
+def test_versions_follow_the_analyzer_source(tmp_path):
+    versions = {analyzer.name: analyzer.version for analyzer in ANALYZERS}
+    assert versions['python_syntax'] == source_version(check_python_syntax, SyntaxChecker)
+    assert versions['python_anti_patterns'] == source_version(detect_anti_patterns)
+
+    module = tmp_path / 'analyzer_module.py'
+    write(module, "def analyze(source):\n    return []\n")
+    namespace = {}
+    exec(compile(module.read_text(), str(module), 'exec'), namespace)
+    before = source_version(namespace['analyze'])
+    assert source_version(namespace['analyze']) == before
+
+    write(module, "def analyze(source):\n    return [{}]\n")
+    assert source_version(namespace['analyze']) != before
@@ -0,0 +1,45 @@
+"""
+Event Bus Tests
+Weak-handler cleanup in EventBus
+"""
+
+import gc
+import threading
+
+from EventBus import EventBus
+
+
+class Widget:
+    def on_change(self, payload):
+        pass
+
+
+def test_owner_collected_while_bus_lock_is_held():
+    bus = EventBus()
+    widget = Widget()
+    bus.subscribe('change', widget.on_change)
+    # The lambda's default is the last strong reference once the name goes,
+    # so unsubscribing frees the widget while _remove holds the lock
+    subscription = bus.subscribe('change', lambda payload, widget=widget: None)
+    del widget
+
+    worker = threading.Thread(target=subscription.unsubscribe, daemon=True)
+    worker.start()
+    worker.join(5)
+
+    assert not worker.is_alive(), "unsubscribe deadlocked on the bus lock"
+    assert bus.listener_count('change') == 0
+
+
+def test_collected_handlers_stop_receiving_events():
+    bus = EventBus()
+    widgets = [Widget() for _ in range(10)]
+    for widget in widgets:
+        bus.subscribe('change', widget.on_change)
+    del widget
+    assert bus.publish('change') == 10
+
+    del widgets[5:]
+    gc.collect()
+    assert bus.publish('change') == 5
+    assert bus.listener_count() == 5
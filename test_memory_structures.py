@@ -0,0 +1,148 @@
+"""
+Memory Structure Tests
+Array tree round trips, registry lifetime and eviction accounting
+"""
+
+import gc
+
+import pytest
+
+from MemoryStructures import ArrayTree, GenerationalRegistry, ProperGlobalRegistry
+
+
+class Payload:
+    pass
+
+# ARRAY TREE
+
+def shape(tree):
+    """(value, depth) per node in pre-order; equal for trees that differ only in numbering"""
+    depths = tree.depths()
+    return [(tree.values[node], depths[node]) for node in tree.preorder()]
+
+
+def test_incremental_and_bulk_builds_agree():
+    parents = [-1, 0, 0, 1, -1, 4, 1, 2]
+    built = ArrayTree()
+    for parent in parents:
+        built.add_node(None, parent)
+    built.values = list(range(len(parents)))
+
+    bulk = ArrayTree.from_parents(parents)
+    for name in ('parent', 'first_child', 'next_sibling', 'last_child'):
+        assert getattr(bulk, name) == getattr(built, name)
+    assert bulk.children(1) == [3, 6]
+    assert bulk.roots() == [0, 4]
+
+
+def test_nodes_round_trip_through_arrays():
+    parents = [-1, 0, 0, 1, -1, 4, 1, 2]
+    tree = ArrayTree.from_parents(parents, values='abcdefgh')
+
+    roots = tree.to_nodes()
+    assert [root.value for root in roots] == ['a', 'e']
+    assert [child.value for child in roots[0].children] == ['b', 'c']
+    assert roots[0].children[0].children[1].parent is roots[0].children[0]
+
+    again = ArrayTree.from_nodes(*roots)
+    assert shape(again) == shape(tree)
+    # from_nodes numbers in pre-order, so a second trip reproduces the arrays exactly
+    final = ArrayTree.from_nodes(*again.to_nodes())
+    assert final.parent == again.parent and final.values == again.values
+
+
+def test_deep_trees_round_trip_without_recursion():
+    depth = 100000
+    tree = ArrayTree.from_parents([-1] + list(range(depth - 1)))
+    (root,) = tree.to_nodes()
+    again = ArrayTree.from_nodes(root)
+    assert again.parent == tree.parent
+    assert again.depths()[-1] == depth - 1
+
+
+def test_bad_parent_arrays_are_rejected():
+    with pytest.raises(ValueError):
+        ArrayTree.from_parents([-1, 5])
+    with pytest.raises(ValueError):
+        ArrayTree.from_parents([-1, 0], values=['only one'])
+
+# GENERATIONAL REGISTRY
+
+def test_global_cache_entry_goes_with_its_data():
+    data = Payload()
+    token = ProperGlobalRegistry.add_to_global_cache(data)
+    assert ProperGlobalRegistry.get_from_global_cache(token) is data
+
+    collected = ProperGlobalRegistry._registry.collected
+    del data
+    gc.collect()
+    assert ProperGlobalRegistry.get_from_global_cache(token) is None
+    assert ProperGlobalRegistry._registry.collected == collected + 1
+
+
+def test_retention_is_explicit_for_every_type():
+    with pytest.raises(TypeError):
+        ProperGlobalRegistry.add_to_global_cache([1, 2, 3])
+
+    token = ProperGlobalRegistry.add_to_global_cache([1, 2, 3], strong=True)
+    gc.collect()
+    assert ProperGlobalRegistry.get_from_global_cache(token) == [1, 2, 3]
+
+    registry = GenerationalRegistry(generation_size=1, max_generations=1)
+    data = Payload()
+    token = registry.register(data, strong=True)
+    del data
+    gc.collect()
+    assert registry.resolve(token) is not None
+    registry.advance_generation()
+    assert registry.resolve(token) is None
+    assert registry.evicted == 1
+
+
+def test_reregistration_switches_retention():
+    registry = GenerationalRegistry()
+    data = Payload()
+    token = registry.register(data)
+    assert registry.register(data, strong=True) == token
+    del data
+    gc.collect()
+    assert registry.resolve(token) is not None
+
+
+def test_deep_memory_usage_survives_collection_during_the_walk():
+    registry = GenerationalRegistry()
+    owners = [Payload() for _ in range(10)]
+
+    class Releasing:
+        """Payload whose size lookup drops the last reference to another registered owner"""
+
+        def __sizeof__(self):
+            if owners:
+                owners.pop()  # Runs the weakref callback right here, mid-walk
+            return 0
+
+    for owner in owners:
+        registry.register(owner, data=Releasing())
+    del owner
+
+    assert registry.memory_usage(deep=True)['entries'] == 10
+    assert len(registry) == 0
+
+
+def test_each_entry_is_counted_once():
+    registry = GenerationalRegistry(generation_size=2, max_generations=1)
+    kept = [Payload() for _ in range(2)]
+    dropped = [Payload() for _ in range(2)]
+    for obj in kept + dropped:
+        registry.register(obj)
+
+    # The first generation (kept) was evicted when the second one started
+    assert registry.evicted == 2
+    del dropped, obj
+    gc.collect()
+    assert registry.collected == 2
+
+    # Collected entries are not evicted again when their generation goes
+    registry.advance_generation()
+    assert registry.evicted == 2
+    assert len(registry) == 0
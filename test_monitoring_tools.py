@@ -0,0 +1,207 @@
+"""
+Monitoring Tool Tests
+Leak sampling, thread-backed profiling, closure analysis and GC policies, asserted as bounds and relations
+"""
+
+import gc
+import json
+import threading
+import time
+import weakref
+
+from MonitoringTools import (
+    FreezePolicy, GCMonitor, GCPolicy, IdleCollectionPolicy, LeakSampler, SamplingProfiler,
+    analyze_closure, find_heavy_closures, slim_closure,
+)
+
+
+def make_cycles(count=100):
+    for _ in range(count):
+        node = {}
+        node['self'] = node
+
+# LEAK DETECTION
+
+leaked = []
+
+
+def leak(count=2000):
+    leaked.extend(object() for _ in range(count))
+
+
+def hold_once(held=[]):
+    if not held:
+        held.append([object() for _ in range(20000)])
+
+
+def test_leak_sampler_flags_only_sites_that_keep_growing():
+    lines = []
+    sampler = LeakSampler(interval=3600, frame_depth=1, growth_windows=3, top=50, output=lines.append)
+    with sampler:
+        for _ in range(5):
+            leak()
+            hold_once()
+            record = sampler.sample()
+    leaked.clear()
+
+    growing = [' '.join(site['site']) for site in record['growing_sites']]
+    leak_line = leak.__code__.co_firstlineno + 1
+    assert any(f"{__file__}:{leak_line}" in site for site in growing)
+    hold_line = hold_once.__code__.co_firstlineno + 2
+    assert not any(f"{__file__}:{hold_line}" in site for site in growing)
+
+    assert [json.loads(line)['window'] for line in lines] == [1, 2, 3, 4, 5]
+    assert len(sampler.recent()) == 5
+
+# SAMPLING PROFILER
+
+def spin(seconds):
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        pass
+
+
+def profile_with_worker(all_threads):
+    worker = threading.Thread(target=spin, args=(0.3,), name='spinning-worker')
+    with SamplingProfiler(rate=500, all_threads=all_threads, backend='thread') as profiler:
+        worker.start()
+        spin(0.3)
+        worker.join()
+    return profiler
+
+
+def test_thread_backend_collects_samples_from_every_thread():
+    profiler = profile_with_worker(all_threads=True)
+    assert profiler.backend == 'thread'
+    assert profiler.sample_count >= 10
+
+    stacks = profiler.stacks
+    assert any(stack.startswith('MainThread;') and 'spin (' in stack for stack in stacks)
+    assert any(stack.startswith('spinning-worker;') and stack.split(';')[-1].startswith('spin (')
+               for stack in stacks)
+    # The sampler never records itself
+    assert not any(stack.startswith('SamplingProfiler;') for stack in stacks)
+    assert sum(stacks.values()) == sum(int(line.rsplit(' ', 1)[1]) for line in profiler.collapsed().splitlines())
+    assert 0.0 < profiler.overhead() < 1.0
+
+
+def test_thread_backend_can_sample_only_the_starting_thread():
+    profiler = profile_with_worker(all_threads=False)
+    assert profiler.sample_count >= 10
+    assert profiler.stacks
+    assert all(stack.startswith('MainThread;') for stack in profiler.stacks)
+
+# CLOSURE ANALYSIS
+
+class Blob:
+
+    def __init__(self, size):
+        self.data = bytearray(size)
+
+
+def make_handler(size=1 << 20):
+    blob = Blob(size)
+    label = 'handler'
+
+    def handler(event, scale=2, *, prefix='>'):
+        return f"{prefix}{label}:{event * scale}:{len(blob.data)}"
+    return handler
+
+
+def make_unfinished():
+    def read():
+        return late
+    return read
+    late = None
+
+
+def test_analysis_reports_captures_largest_first():
+    report = analyze_closure(make_handler())
+    captures = {capture['name']: capture for capture in report['captures']}
+
+    assert report['captures'][0]['name'] == 'blob'
+    assert captures['blob']['kind'] == 'closure' and captures['blob']['type'] == 'Blob'
+    assert captures['blob']['reachable_bytes'] > 1 << 20 > captures['blob']['shallow_bytes']
+    assert captures['label']['referenced']
+    assert captures['scale']['kind'] == captures['prefix']['kind'] == 'default'
+    assert report['total_bytes'] == sum(capture['reachable_bytes'] for capture in report['captures'])
+    assert report['unreferenced_bytes'] == 0
+    assert report['function'].endswith('make_handler.<locals>.handler')
+
+
+def test_empty_cells_are_skipped():
+    assert analyze_closure(make_unfinished())['captures'] == []
+
+
+def test_slimming_releases_dropped_captures():
+    handler = make_handler()
+    blob = weakref.ref(handler.__closure__[handler.__code__.co_freevars.index('blob')].cell_contents)
+    slim = slim_closure(handler, drop=('blob',))
+    assert slim.__qualname__ == handler.__qualname__
+    assert slim.__kwdefaults__ == {'prefix': '>'}
+
+    del handler
+    gc.collect()
+    assert blob() is None
+    assert analyze_closure(slim)['total_bytes'] < 1 << 10
+
+
+def test_heavy_closures_are_filtered_and_sorted():
+    small, large = make_handler(1 << 10), make_handler(4 << 20)
+    heavy = find_heavy_closures([small, large, make_handler(2 << 20)], min_bytes=1 << 20)
+    assert [report['captures'][0]['reachable_bytes'] > 4 << 20 for report in heavy] == [True, False]
+    assert heavy[0]['total_bytes'] >= heavy[1]['total_bytes']
+
+# GC POLICIES
+
+def test_idle_policy_collects_in_idle_windows():
+    gc.collect()
+    with IdleCollectionPolicy(idle_after=0.005, max_delay=10.0) as policy:
+        for _ in range(3):
+            with policy.busy():
+                make_cycles()
+                gc.collect(0)  # Promote survivors into the deferred generation
+            time.sleep(0.05)
+    # One collection per idle window at most, and max_delay never ran out
+    assert 1 <= policy.idle_collections <= 3
+    assert policy.forced_collections < policy.idle_collections
+
+
+def test_idle_policy_sleeps_while_nothing_happens():
+    with IdleCollectionPolicy(idle_after=0.002, max_delay=10.0) as policy:
+        time.sleep(0.3)
+    # Polling every idle_after would wake about 150 times
+    assert policy.wakeups < 10
+
+
+def test_idle_policy_forces_collection_under_constant_load():
+    gc.collect()
+    with IdleCollectionPolicy(max_delay=0.05) as policy:
+        with policy.busy():
+            deadline = time.perf_counter() + 0.3
+            while time.perf_counter() < deadline:
+                make_cycles(10)
+                gc.collect(0)
+                time.sleep(0.001)
+    assert policy.forced_collections >= 1
+    assert policy.forced_collections > policy.idle_collections
+
+
+def full_collections(policy, heap_size=200000, rounds=3):
+    """Objects left in the oldest generation and total full-collection pause under policy"""
+    heap = [[index] for index in range(heap_size)]
+    gc.collect()
+    with policy, GCMonitor() as monitor:
+        for _ in range(rounds):
+            gc.collect()
+        scanned = len(gc.get_objects(generation=2))
+    del heap
+    gc.collect()
+    return scanned, monitor.histograms[2].total
+
+
+def test_freeze_leaves_less_for_full_collections_than_the_baseline():
+    baseline_scanned, baseline_pause = full_collections(GCPolicy())
+    frozen_scanned, frozen_pause = full_collections(FreezePolicy())
+    assert frozen_scanned < baseline_scanned - 100000
+    assert frozen_pause < baseline_pause
@@ -0,0 +1,121 @@
+"""
+Performance Engine Tests
+Efficient engines against the output of the anti-patterns they replace
+"""
+
+from decimal import Decimal
+
+from array import array
+
+import pytest
+
+import PerformanceEngines
+from MemoryAndPerformance import PerformanceAntiPatterns
+from PerformanceEngines import EqualValueJoin, ExpensiveOperationsPipeline, IntBuffer, MembershipIndex
+
+
+def backends():
+    return ['array', 'numpy'] if PerformanceEngines.np is not None else ['array']
+
+# INT BUFFER
+
+@pytest.mark.parametrize('backend', backends())
+def test_append_and_extend_keep_order(backend):
+    buffer = IntBuffer([1, 2], backend=backend, capacity=1)
+    buffer.append(3)
+    buffer.extend(range(4, 100))
+    buffer.extend(array('q', [100]))
+    buffer.extend(i for i in (101, 102))
+    assert buffer.to_list() == list(range(1, 103))
+    assert list(buffer) == buffer.to_list()
+    assert (len(buffer), buffer[0], buffer[-1]) == (102, 1, 102)
+    assert buffer.memoryview().tolist() == buffer.to_list()
+    assert buffer.nbytes == 102 * 8
+
+
+@pytest.mark.parametrize('backend', backends())
+def test_capacity_is_the_allocation_and_grows_geometrically(backend):
+    buffer = IntBuffer(backend=backend)
+    capacities = set()
+    for i in range(100000):
+        buffer.append(i)
+        assert buffer.capacity >= len(buffer)
+        capacities.add(buffer.capacity)
+    # One reallocation per append would give 100000 distinct capacities; array grows by 1/8
+    assert len(capacities) < 200
+
+
+def test_array_capacity_runs_ahead_of_length():
+    buffer = IntBuffer(range(5))
+    buffer.append(5)
+    assert buffer.capacity > len(buffer)
+
+
+def test_backend_selection(monkeypatch):
+    assert IntBuffer().backend == 'array'
+    with pytest.raises(ValueError):
+        IntBuffer(backend='list')
+    monkeypatch.setattr(PerformanceEngines, 'np', None)
+    with pytest.raises(ImportError):
+        IntBuffer(backend='numpy')
+
+# EQUAL-VALUE JOIN
+
+def brute_force_pairs(matrix):
+    cells = [(i, j, value) for i, row in enumerate(matrix) for j, value in enumerate(row)]
+    return [(i, j, k, l) for i, j, value in cells for k, l, other in cells if value == other]
+
+
+@pytest.mark.parametrize('use_numpy', [None, False])
+def test_join_count_matches_the_nested_loops(use_numpy):
+    for n in (0, 1, 2, 7):
+        expected = PerformanceAntiPatterns().nested_loop_inefficiency(n)
+        assert EqualValueJoin.from_size(n, use_numpy=use_numpy).count() == expected
+
+
+@pytest.mark.parametrize('use_numpy', [None, False])
+def test_join_pairs_come_in_nested_loop_order(use_numpy):
+    join = EqualValueJoin.from_size(5, use_numpy=use_numpy)
+    matrix = [[i + j for j in range(5)] for i in range(5)]
+    assert list(join.pairs()) == brute_force_pairs(matrix)
+    # Counting after the index exists takes the index path and must still agree
+    assert len(join) == len(brute_force_pairs(matrix))
+
+
+def test_join_handles_ragged_values_and_rectangular_matrices():
+    matrix = [[3, 1, 3], [1, 2, 3]]
+    join = EqualValueJoin(matrix, use_numpy=False)
+    assert join.count() == len(brute_force_pairs(matrix)) == 14
+    assert list(join.pairs()) == brute_force_pairs(matrix)
+
+# EXPENSIVE OPERATIONS PIPELINE
+
+def test_pipeline_matches_the_original_for_mixed_items():
+    items = list(range(-50, 50)) + [0.5, 2 ** 70, True]
+    pipeline = ExpensiveOperationsPipeline(chunk_size=16)
+    assert pipeline.run(items) == PerformanceAntiPatterns().repeated_expensive_operations(items)
+
+
+def test_equal_values_that_print_differently_are_cached_apart():
+    items = [0.0, -0.0, Decimal('1.0'), Decimal('1.00'), 5, 5.0]
+    result = ExpensiveOperationsPipeline().run(items)
+    assert result == PerformanceAntiPatterns().repeated_expensive_operations(items)
+    assert result[:2] == ['.00', '-.00']
+    assert result[2] != result[3]
+
+# MEMBERSHIP INDEX
+
+@pytest.mark.parametrize('strategy', ['bitmap', 'sorted_array'])
+@pytest.mark.parametrize('use_numpy', [None, False])
+def test_footprint_table_agrees_with_the_measured_footprint(strategy, use_numpy):
+    index = MembershipIndex(range(100), strategy=strategy, use_numpy=use_numpy)
+    assert index.footprints()[strategy] == index.memory_footprint()
+    assert index.footprints() == {'set': index.footprints()['set'], 'bitmap': 100, 'sorted_array': 800}
+
+
+@pytest.mark.parametrize('strategy', ['bitmap', 'sorted_array'])
+def test_uint64_queries_above_int64_never_wrap_into_hits(strategy):
+    np = pytest.importorskip('numpy')
+    index = MembershipIndex([-1, 5, 7], strategy=strategy)
+    queries = np.array([2 ** 64 - 1, 5, 2 ** 63, 7], dtype=np.uint64)
+    assert index.contains_many(queries).tolist() == [False, True, False, True]
@@ -0,0 +1,276 @@
+"""
+Resource Pool Tests
+Pool and writer behaviour against in-process fakes, a loopback listener and temp files
+"""
+
+import asyncio
+import gc
+import os
+import socket
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from ResourcePools import (
+    BulkFileWriter, ConnectionPool, FakeConnection, FileSlots, PooledResourceManagement, SocketPool,
+    WorkerPool, current_rss, fake_connection_factory,
+)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+# CONNECTION POOL
+
+def test_concurrent_checkout_stays_within_max_size():
+    pool = ConnectionPool(fake_connection_factory(connect_latency=0.001), max_size=4)
+
+    def request(_):
+        with pool.connection() as connection:
+            assert connection.ping()
+            time.sleep(0.001)
+
+    with ThreadPoolExecutor(max_workers=16) as executor:
+        list(executor.map(request, range(200)))
+
+    metrics = pool.metrics()
+    assert metrics['peak_size'] <= 4
+    assert metrics['peak_in_use'] <= 4
+    assert metrics['in_use'] == 0
+    assert metrics['created'] == metrics['size'] <= 4
+    assert metrics['acquisitions'] == 200
+
+
+def test_idle_connections_are_reused():
+    pool = ConnectionPool(fake_connection_factory(), max_size=2)
+    with pool.connection() as first:
+        pass
+    with pool.connection() as second:
+        assert second is first
+    assert pool.metrics()['created'] == 1
+
+
+def test_acquire_times_out_when_exhausted():
+    pool = ConnectionPool(fake_connection_factory(), max_size=1)
+    held = pool.acquire()
+    with pytest.raises(TimeoutError):
+        pool.acquire(timeout=0.05)
+    pool.release(held)
+    pool.release(pool.acquire(timeout=0.05))
+
+
+def test_idle_timeout_prunes_down_to_min_size():
+    clock = FakeClock()
+    pool = ConnectionPool(fake_connection_factory(), min_size=1, max_size=3, idle_timeout=10.0, clock=clock)
+    connections = [pool.acquire() for _ in range(3)]
+    for connection in connections:
+        pool.release(connection)
+
+    clock.now = 11.0
+    assert pool.prune() == 2
+    assert pool.metrics()['size'] == 1
+    assert sum(connection.status == 'closed' for connection in connections) == 2
+
+
+def test_failed_health_check_replaces_the_connection():
+    pool = ConnectionPool(fake_connection_factory(), max_size=1, health_check=FakeConnection.ping)
+    with pool.connection() as connection:
+        connection.status = 'broken'
+    with pool.connection() as replacement:
+        assert replacement is not connection
+        assert replacement.ping()
+
+    metrics = pool.metrics()
+    assert metrics['health_failures'] == 1
+    assert metrics['size'] == 1
+
+
+def test_raising_health_check_frees_the_slot():
+    def health_check(connection):
+        if connection.id == 0:
+            raise ConnectionError("server went away")
+        return True
+
+    pool = ConnectionPool(fake_connection_factory(), max_size=1, health_check=health_check)
+    with pool.connection() as connection:
+        pass
+    with pool.connection(timeout=0.5) as replacement:
+        assert replacement.id == 1
+
+    assert connection.status == 'closed'
+    assert pool.metrics()['in_use'] == 0
+
+
+def test_async_checkout():
+    pool = ConnectionPool(fake_connection_factory(), max_size=2)
+
+    async def main():
+        async def request():
+            async with pool.connection_async() as connection:
+                await asyncio.sleep(0.001)
+                return connection.id
+        return await asyncio.gather(*(request() for _ in range(10)))
+
+    assert len(asyncio.run(main())) == 10
+    assert pool.metrics()['peak_size'] <= 2
+    assert pool.metrics()['in_use'] == 0
+
+
+def test_cancelled_async_acquire_returns_its_connection():
+    pool = ConnectionPool(fake_connection_factory(), max_size=1)
+    held = pool.acquire()
+    released = threading.Timer(0.05, pool.release, (held,))
+
+    async def main():
+        task = asyncio.create_task(pool.acquire_async())
+        await asyncio.sleep(0.01)  # Let the executor thread block in acquire()
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        released.start()
+        # The abandoned acquire completes once the slot frees up and hands it straight back
+        for _ in range(100):
+            await asyncio.sleep(0.01)
+            if pool.metrics()['in_use'] == 0 and pool.metrics()['acquisitions'] == 2:
+                break
+
+    asyncio.run(main())
+    metrics = pool.metrics()
+    assert metrics['in_use'] == 0
+    assert metrics['idle'] == 1
+    pool.release(pool.acquire(timeout=0.5))
+
+# SOCKET POOL
+
+def test_socket_pool_refuses_checkout_after_close():
+    with socket.create_server(('127.0.0.1', 0)) as server:
+        host, port = server.getsockname()
+        pool = SocketPool(max_per_host=2)
+        with pool.connection(host, port) as sock:
+            pass
+        pool.close()
+
+        assert sock.fileno() == -1
+        with pytest.raises(RuntimeError):
+            pool.acquire(host, port)
+        assert pool.metrics() == {}
+
+# BULK FILE WRITER
+
+def test_descriptor_cap_spans_concurrent_writers(tmp_path):
+    slots = FileSlots(2)
+    data = b'x' * 100000  # Large enough that writes overlap
+    writers = [BulkFileWriter(workers=4, buffer_size=4096, slots=slots) for _ in range(3)]
+
+    def run(index):
+        target = tmp_path / str(index)
+        target.mkdir()
+        return writers[index].write_files((target / f"temp_file_{i}.txt", data) for i in range(40))
+
+    with ThreadPoolExecutor(max_workers=3) as executor:
+        results = list(executor.map(run, range(3)))
+
+    assert all(result == [len(data)] * 40 for result in results)
+    assert slots.peak_open_files <= 2
+    assert slots.open_files == 0
+
+
+def test_writers_with_different_caps_share_one_budget(tmp_path):
+    assert BulkFileWriter(max_open_files=16)._slots is BulkFileWriter(max_open_files=64)._slots
+
+    slots = FileSlots(3)
+    data = b'x' * 100000
+    writers = [BulkFileWriter(max_open_files=cap, workers=4, buffer_size=4096, slots=slots) for cap in (1, 16)]
+
+    def run(index):
+        target = tmp_path / str(index)
+        target.mkdir()
+        return writers[index].write_files((target / f"temp_file_{i}.txt", data) for i in range(40))
+
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        list(executor.map(run, range(2)))
+    assert slots.peak_open_files <= 3
+
+
+def test_writer_cap_applies_within_a_larger_budget(tmp_path):
+    slots = FileSlots(64)
+    writer = BulkFileWriter(max_open_files=2, workers=8, buffer_size=4096, slots=slots)
+    writer.write_files((tmp_path / f"temp_file_{i}.txt", b'x' * 100000) for i in range(40))
+    assert 1 <= slots.peak_open_files <= 2
+
+
+def test_failed_writes_still_close_their_descriptors(tmp_path):
+    slots = FileSlots(3)
+    writer = BulkFileWriter(max_open_files=3, workers=2, slots=slots)
+    files = [(tmp_path / f"ok_{i}.txt", b'data') for i in range(5)]
+    files.insert(2, (tmp_path / 'missing' / 'bad.txt', b'data'))
+
+    with pytest.raises(FileNotFoundError):
+        writer.write_files(files)
+    assert slots.open_files == 0
+    assert all(os.path.getsize(path) == 4 for path, _ in files if path.parent == tmp_path)
+
+# WORKER POOL
+
+def test_shutdown_returns_thread_count_to_baseline():
+    baseline = threading.active_count()
+    pool = WorkerPool(max_workers=4)
+    futures = [pool.submit(sum, range(i * 1000)) for i in range(50)]
+    for _ in range(3):
+        PooledResourceManagement().managed_background_worker(pool)
+
+    assert [future.result(timeout=5) for future in futures] == [sum(range(i * 1000)) for i in range(50)]
+    assert baseline < threading.active_count() <= baseline + 4 + 3
+
+    assert pool.shutdown(timeout=5) == []
+    assert threading.active_count() == baseline
+    assert pool.live_threads() == 0
+    with pytest.raises(RuntimeError):
+        pool.submit(sum, ())
+
+
+def test_shutdown_cancels_queued_tasks():
+    baseline = threading.active_count()
+    release = threading.Event()
+    with WorkerPool(max_workers=1) as pool:
+        running = pool.submit(release.wait, 5)
+        queued = [pool.submit(sum, ()) for _ in range(5)]
+        threading.Timer(0.05, release.set).start()
+    # The timer thread exits right after firing
+    time.sleep(0.1)
+
+    assert running.result() is True
+    assert all(future.cancelled() for future in queued)
+    assert threading.active_count() == baseline
+
+
+def test_recycled_workers_return_rss_to_baseline():
+    if current_rss() is None:
+        pytest.skip("RSS is not readable on this platform")
+
+    def cycle():
+        pool = WorkerPool(max_workers=8)
+        futures = [pool.submit(lambda: len(bytearray(1 << 20))) for _ in range(64)]
+        for _ in range(4):
+            # Each background job holds a ~4 MB list until the pool stops it
+            PooledResourceManagement().managed_background_worker(pool)
+        assert [future.result(timeout=5) for future in futures] == [1 << 20] * 64
+        assert pool.shutdown(timeout=5) == []
+
+    # Warm-up cycles let the allocator settle its per-thread arenas
+    for _ in range(5):
+        cycle()
+    gc.collect()
+    baseline = current_rss()
+    for _ in range(10):
+        cycle()
+    gc.collect()
+
+    # Leaked jobs would keep about 160 MB alive here
+    assert current_rss() - baseline < 32 * 1024 * 1024
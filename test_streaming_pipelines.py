@@ -0,0 +1,119 @@
+"""
+Streaming Pipeline Tests
+Lazy Stream stages, producer-thread failure handling in iterate_in_thread and TextEmitter sink handling
+"""
+
+import asyncio
+import io
+import itertools
+
+import pytest
+
+from MemoryAndPerformance import IteratorIssues
+from StreamingPipelines import Stream, StreamingIterators, TextEmitter, iterate_in_thread
+
+
+async def collect(iterable):
+    return [item async for item in iterate_in_thread(iterable, chunk_size=2)]
+
+# STREAM PIPELINE
+
+def test_stages_run_only_as_items_are_pulled():
+    seen = []
+    stream = Stream.count().map(lambda i: seen.append(i) or i * i).filter(lambda i: i % 2)
+    assert seen == []
+    assert stream.take(3).collect() == [1, 9, 25]
+    assert seen == [0, 1, 2, 3, 4, 5]
+
+
+def test_stages_compose_like_their_itertools_counterparts():
+    stream = Stream.range(20).skip(2).take_while(lambda i: i < 15).map(str)
+    assert stream.collect() == [str(i) for i in range(2, 15)]
+    assert Stream.range(7).batch(3).collect() == [(0, 1, 2), (3, 4, 5), (6,)]
+    assert Stream.range(10).collect(limit=4) == [0, 1, 2, 3]
+
+
+def test_sinks():
+    assert Stream.range(5).sum() == 10
+    assert Stream.range(5).reduce(lambda total, i: total * 10 + i, 0) == 1234
+    assert Stream.range(5).count_items() == 5
+    assert (Stream.range(5).min(), Stream.range(5).max(), Stream.range(5).last()) == (0, 4, 4)
+    assert (Stream.range(0).min(-1), Stream.range(0).last('none')) == (-1, 'none')
+    items = []
+    Stream.range(3).for_each(items.append)
+    assert items == [0, 1, 2]
+
+
+def test_cycle_range_repeats_without_caching():
+    assert Stream.cycle_range(3).take(7).collect() == [0, 1, 2, 0, 1, 2, 0]
+    with pytest.raises(ValueError):
+        Stream.cycle_range(0)
+    with pytest.raises(ValueError):
+        Stream.range(3).batch(0)
+
+
+def test_streams_match_the_generators_they_replace():
+    streaming, original = StreamingIterators(), IteratorIssues()
+    assert list(streaming.range_backed_generator()) == list(original.generator_memory_leak())
+    assert streaming.bounded_infinite_consumption().collect() == original.infinite_generator_consumption()
+    assert list(itertools.islice(streaming.bounded_infinite_consumption(limit=5), 10)) == list(range(6))
+
+# ITERATE IN THREAD
+
+def test_items_arrive_in_order():
+    assert asyncio.run(collect(range(7))) == list(range(7))
+
+
+def test_non_iterable_source_raises_instead_of_hanging():
+    with pytest.raises(TypeError):
+        asyncio.run(asyncio.wait_for(collect(42), timeout=5))
+
+
+def test_base_exception_in_source_reaches_the_consumer():
+    class Abort(BaseException):
+        pass
+
+    def source():
+        yield 1
+        raise Abort()
+
+    with pytest.raises(Abort):
+        asyncio.run(asyncio.wait_for(collect(source()), timeout=5))
+
+# TEXT EMITTER
+
+def test_text_sink_output_keeps_its_order():
+    raw = io.BytesIO()
+    sink = io.TextIOWrapper(raw, encoding='utf-8', newline='')
+    sink.write('HEADER\n')
+    with TextEmitter(sink, buffer_size=4) as emitter:
+        emitter.write('body\n')
+    sink.write('FOOTER\n')
+    sink.flush()
+    assert raw.getvalue() == b'HEADER\nbody\nFOOTER\n'
+
+
+def test_text_sink_encoding_and_errors_are_used():
+    raw = io.BytesIO()
+    sink = io.TextIOWrapper(raw, encoding='ascii', errors='replace', newline='')
+    with TextEmitter(sink) as emitter:
+        emitter.write('caf\u00e9\n')
+    sink.flush()
+    assert emitter.encoding == 'ascii'
+    assert raw.getvalue() == b'caf?\n'
+
+
+def test_explicit_encoding_goes_through_the_text_layer():
+    raw = io.BytesIO()
+    sink = io.TextIOWrapper(raw, encoding='utf-16-le', newline='')
+    with TextEmitter(sink, buffer_size=3, encoding='utf-8') as emitter:
+        emitter.write('\u00e9\u20ac\n')  # Multi-byte characters split across flushes
+    sink.flush()
+    assert raw.getvalue() == '\u00e9\u20ac\n'.encode('utf-16-le')
+
+
+def test_string_sink_receives_text():
+    sink = io.StringIO()
+    with TextEmitter(sink, buffer_size=2) as emitter:
+        emitter.emit_formatted(b'Item %d\n', range(3))
+    assert sink.getvalue() == 'Item 0\nItem 1\nItem 2\n'
@@ -0,0 +1,98 @@
+"""
+Syntax Checker Tests
+Valid constructs that must not be reported, and faults that must be
+"""
+
+import pytest
+
+from SyntaxChecker import SyntaxChecker
+
+
+def errors(source):
+    return [(issue['line'], issue['column'], issue['message'])
+            for issue in SyntaxChecker(warnings=False).check(source)]
+
+# FALSE POSITIVES
+
+@pytest.mark.parametrize('source', [
+    'from ...pkg import name\n',
+    'from .... import name\n',
+    'from ...pkg.sub import (a, b)\n',
+    'if ready: from ..pkg import name\n',
+    'value = ...\n',
+    'def stub(): ...\n',
+])
+def test_relative_import_dots_are_not_an_ellipsis(source):
+    compile(source, '<test>', 'exec')
+    assert errors(source) == []
+
+
+@pytest.mark.parametrize('source', [
+    'cafe\u0301 = 1\nprint(cafe\u0301)\n',  # e followed by a combining acute accent
+    'café = 1\n',
+    'x·y = 1\n',  # Middle dot may continue an identifier
+    'Ångström = 1\n',  # Normalized to NFKC by the compiler
+])
+def test_non_ascii_identifiers_are_accepted(source):
+    compile(source, '<test>', 'exec')
+    assert errors(source) == []
+
+@pytest.mark.parametrize('source', [
+    'x = lambda a, /, b: a\n',
+    'x = lambda a, /: a\n',
+    'f(lambda a, /, *, b: a)\n',
+])
+def test_lambda_positional_only_marker_is_accepted(source):
+    compile(source, '<test>', 'exec')
+    assert errors(source) == []
+
+
+@pytest.mark.parametrize('source', [
+    '"a".__class__ = X\n',
+    '"a"[0] = x\n',
+    '(1).real = x\n',
+])
+def test_literal_with_a_trailer_is_a_valid_target(source):
+    compile(source, '<test>', 'exec')
+    assert errors(source) == []
+
+
+@pytest.mark.parametrize('source', [
+    'def f(items):\n    return (await item for item in items)\n',
+    'def f(items):\n    return (g(await item) for item in items)\n',
+    '(await item for item in items)\n',
+])
+def test_await_in_generator_expression_is_accepted(source):
+    compile(source, '<test>', 'exec')
+    assert errors(source) == []
+
+# REPORTED FAULTS
+
+@pytest.mark.parametrize('source, expected', [
+    ('x = 1 → 2\n', (1, 7, "invalid character '→' (U+2192)")),
+    ('a→b = 1\n', (1, 2, "invalid character '→' (U+2192)")),
+    ('\u0301x = 1\n', (1, 1, "invalid character '\u0301' (U+0301)")),
+])
+def test_invalid_characters_match_the_compiler(source, expected):
+    with pytest.raises(SyntaxError) as error:
+        compile(source, '<test>', 'exec')
+    assert (error.value.lineno, error.value.offset, error.value.msg) == expected
+    assert errors(source) == [expected]
+
+
+@pytest.mark.parametrize('source', [
+    '1 = x\n',
+    'a, 1 = x\n',
+    'def f():\n    g(await x)\n',
+    'def f(items):\n    return [await item for item in items]\n',
+    'await x\n',
+])
+def test_misplaced_literals_and_awaits_match_the_compiler(source):
+    with pytest.raises(SyntaxError) as error:
+        compile(source, '<test>', 'exec')
+    assert errors(source) == [(error.value.lineno, error.value.offset, error.value.msg)]
+
+
+def test_every_fault_is_reported_in_one_pass():
+    source = 'from module\nvalue = (1 +\ndef f()\n    return 1\n'
+    assert [line for line, _, _ in errors(source)] == [1, 2, 3]